@@ -0,0 +1,90 @@
+from statistics import NormalDist
+
+import numpy as np
+
+import math1
+import math2
+from streaming import RunningMoments, QuantileSketch
+
+STATISTICS = {'mean': None, 'median': 50, '5th_percentile': 5, '95th_percentile': 95}
+
+def run_until(sample_batch, tol, bounds, statistic='mean', relative=False, confidence=0.95,
+              batch_size=1000, max_simulations=10**7):
+    """
+    分批仿真，直到所选统计量的置信区间半宽不超过 tol
+    sample_batch(n) -- 返回 n 次仿真的总产能
+    tol -- 半宽容差；relative=True 时为相对当前估计值的比例
+    bounds -- 总产能的理论范围 (下限, 上限)，用于分位数草图
+    statistic -- 'mean'、'median'、'5th_percentile' 或 '95th_percentile'
+    batch_size -- 首批仿真次数，之后按当前半宽外推所需次数，至少翻倍但不超过剩余额度
+    均值的半宽为 z * std / sqrt(n)；分位数 p 的半宽取与分布无关的次序统计量区间
+    [q(p - z*sqrt(p(1-p)/n)), q(p + z*sqrt(p(1-p)/n))] 的一半
+    返回 (统计量字典, 仿真次数, 半宽, 是否达到容差)
+    """
+    if statistic not in STATISTICS:
+        raise ValueError(f"统计量须为 {list(STATISTICS)} 之一")
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    moments = RunningMoments()
+    sketch = QuantileSketch(*bounds)
+
+    n_next = max(2, int(batch_size))
+    while True:
+        n_next = min(n_next, max_simulations - moments.count)
+        values = sample_batch(n_next)
+        moments.update(values)
+        sketch.update(values)
+
+        n = moments.count
+        p = STATISTICS[statistic]
+        if p is None:
+            estimate = moments.mean
+            half_width = z * moments.std / np.sqrt(n)
+        else:
+            estimate = sketch.percentile(p)
+            spread = 100 * z * np.sqrt(p / 100 * (1 - p / 100) / n)
+            lower, upper = sketch.percentile([max(p - spread, 0), min(p + spread, 100)])
+            half_width = (upper - lower) / 2
+        target = tol * abs(estimate) if relative else tol
+        converged = half_width <= target
+        if converged or n >= max_simulations:
+            break
+        # 半宽约按 1/sqrt(n) 缩小，外推达到容差所需的总次数
+        needed = n * (half_width / max(target, 1e-300)) ** 2 * 1.1 if target > 0 else 2 * n
+        n_next = int(min(max(needed - n, n), 1e9))
+
+    return math1._summarize((moments, sketch)), n, half_width, converged
+
+def adaptive_production_capacity(N, s, T, k, total_time, tol, statistic='mean', relative=False,
+                                 confidence=0.95, batch_size=1000, max_simulations=10**7, rng=None):
+    """
+    自适应次数的 math1.simulate_production_capacity
+    返回的统计量字典另含 num_simulations(实际仿真次数)、half_width、converged
+    rng -- 随机数生成器，默认使用全局 np.random
+    """
+    rng = np.random if rng is None else rng
+    low, high = math1._step_time_range(s, T, k, '自适应模式')
+
+    stats, n, half_width, converged = run_until(
+        lambda n: math1._sample_total_capacities(N, s, low, high, total_time, n, rng),
+        tol, (N * total_time / high, N * total_time / low), statistic, relative, confidence,
+        batch_size, max_simulations)
+    stats.update({'distribution_params': math1._distribution_params(s, T, k),
+                  'num_simulations': n, 'half_width': half_width, 'converged': converged})
+    return stats
+
+def adaptive_capacity(N, S, T, k, total_time, tol, statistic='mean', relative=False,
+                      confidence=0.95, batch_size=1000, max_simulations=10**7, rng=None):
+    """
+    自适应次数的 math2.simulate_capacity，返回统计量字典，附加字段同 adaptive_production_capacity
+    """
+    rng = np.random if rng is None else rng
+    low, high = math2._step_time_range(S, T, k)
+    if low <= 0:
+        raise ValueError("自适应模式要求工序时间下限为正(k > 1)")
+
+    stats, n, half_width, converged = run_until(
+        lambda n: math2._sample_capacities(N, S, low, high, total_time, n, rng),
+        tol, (N * np.floor(total_time / high), N * np.floor(total_time / low) + 1), statistic,
+        relative, confidence, batch_size, max_simulations)
+    stats.update({'num_simulations': n, 'half_width': half_width, 'converged': converged})
+    return stats
@@ -0,0 +1,105 @@
+from functools import lru_cache
+
+import numpy as np
+
+from math1 import _distribution_params, _step_time_range, _summary
+
+@lru_cache(maxsize=8)
+def _gauss_legendre(nodes):
+    # [0, 1] 上的求积节点与权重
+    x, w = np.polynomial.legendre.leggauss(nodes)
+    return (x + 1) / 2, w / 2
+
+def _line_params(s, T, k):
+    return _step_time_range(s, T, k, '解析模型')
+
+def line_capacity_moments(s, T, k, total_time, nodes=256):
+    """
+    单条生产线产能 X = total_time / C 的均值与方差
+    节拍 C = low + (high - low) * M，M 为 s 个 U(0,1) 的最大值，密度 s * m^(s-1)
+    E[X^r] = ∫ (total_time / (low + (high-low) m))^r * s m^(s-1) dm，用 Gauss-Legendre 求积
+    """
+    low, high = _line_params(s, T, k)
+    m, w = _gauss_legendre(nodes)
+    weights = w * s * m ** (s - 1)
+    capacity = total_time / (low + (high - low) * m)
+    mean = np.sum(weights * capacity)
+    var = np.sum(weights * capacity ** 2) - mean ** 2
+    return mean, max(var, 0.0)
+
+def line_capacity_cdf(x, s, T, k, total_time):
+    """
+    单条生产线产能的分布函数 P(X <= x) = 1 - ((total_time/x - low) / (high - low))^s
+    """
+    low, high = _line_params(s, T, k)
+    x = np.asarray(x, dtype=float)
+    with np.errstate(divide='ignore'):
+        m = np.clip((total_time / x - low) / (high - low), 0, 1)
+    return 1 - m ** s
+
+def line_capacity_quantile(q, s, T, k, total_time):
+    """
+    单条生产线产能的 q 分位数(q 为 0~1)，由 M 的 (1-q) 分位数 (1-q)^(1/s) 直接得到
+    """
+    low, high = _line_params(s, T, k)
+    q = np.asarray(q, dtype=float)
+    return total_time / (low + (high - low) * (1 - q) ** (1 / s))
+
+def total_capacity_distribution(N, s, T, k, total_time, bins=4096):
+    """
+    N 条独立生产线总产能的离散分布，返回 (取值网格, 概率)
+    单线产能离散到 bins 个等宽箱，用 FFT 做 N 重卷积
+    """
+    low, high = _line_params(s, T, k)
+    x_min, x_max = total_time / high, total_time / low
+    edges = np.linspace(x_min, x_max, bins + 1)
+    p = np.diff(line_capacity_cdf(edges, s, T, k, total_time))
+    p /= p.sum()
+    h = edges[1] - edges[0]
+
+    size = N * (bins - 1) + 1
+    n_fft = 1 << int(np.ceil(np.log2(size)))
+    total = np.fft.irfft(np.fft.rfft(p, n_fft) ** N, n_fft)[:size]
+    total = np.clip(total, 0, None)
+    total /= total.sum()
+    # 每个箱的概率集中在箱中点，N 个中点之和的网格
+    grid = N * (x_min + h / 2) + h * np.arange(size)
+    return grid, total
+
+def analytic_production_capacity(N, s, T, k, total_time, bins=4096):
+    """
+    不经抽样直接计算 math1.simulate_production_capacity 的统计量，返回相同结构的字典
+    均值、标准差为精确值(数值积分)；N=1 时分位数为精确值，N>1 时由卷积分布插值得到；
+    min / max 为总产能的理论上下界
+    """
+    low, high = _line_params(s, T, k)
+    mean, var = line_capacity_moments(s, T, k, total_time)
+    qs = np.array([0.5, 0.05, 0.95])
+    if N == 1:
+        median, p5, p95 = line_capacity_quantile(qs, s, T, k, total_time)
+    else:
+        grid, prob = total_capacity_distribution(N, s, T, k, total_time, bins)
+        cdf = np.cumsum(prob)
+        median, p5, p95 = np.interp(qs, cdf, grid)
+    return _summary(N * mean, np.sqrt(N * var), N * total_time / high, N * total_time / low,
+                    median, p5, p95, _distribution_params(s, T, k))
+
+def cross_check(N, s, T, k, total_time, num_simulations=100000, rng=None):
+    """
+    解析结果与蒙特卡洛仿真对照，返回每个统计量一行的 DataFrame
+    z 列为均值差按蒙特卡洛标准误标准化后的值，|z| 远大于 3 说明两者不一致
+    """
+    import pandas as pd
+    from math1 import simulate_production_capacity
+
+    exact = analytic_production_capacity(N, s, T, k, total_time)
+    mc = simulate_production_capacity(N, s, T, k, total_time, num_simulations, rng=rng)
+    rows = []
+    for key in ['mean', 'std', 'median', '5th_percentile', '95th_percentile']:
+        rows.append({'statistic': key, 'analytic': exact[key], 'monte_carlo': mc[key],
+                     'rel_diff': (mc[key] - exact[key]) / exact[key]})
+    df = pd.DataFrame(rows)
+    df['z'] = np.nan
+    df.loc[df['statistic'] == 'mean', 'z'] = \
+        (mc['mean'] - exact['mean']) / (exact['std'] / np.sqrt(num_simulations))
+    return df
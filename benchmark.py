@@ -0,0 +1,130 @@
+"""
+仿真与优化函数的性能基准
+    python benchmark.py                              # 运行全部基准并写入 benchmark_results.json
+    python benchmark.py --quick                      # 只跑小规模参数
+    python benchmark.py --baseline old.json          # 与基线对比，变慢超过阈值时返回码为 1
+记录每个用例多次运行的最短/平均耗时与峰值内存(tracemalloc)
+tracemalloc 只统计本进程的分配，多进程用例(workers > 1)的峰值内存记为 null
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+import math1
+import math2
+import math3_2
+import parallel_mc
+
+def _cases(quick):
+    total_time = 24 * 60
+    sims = [10**4] if quick else [10**4, 10**5]
+    workers = [48, 500] if quick else [48, 500, 5000]
+    for n in sims:
+        for N, s in [(6, 1), (2, 3), (1, 6), (16, 4)]:
+            yield ('simulate_production_capacity', {'N': N, 's': s, 'num_simulations': n},
+                   lambda N=N, s=s, n=n: math1.simulate_production_capacity(N, s, 10, 8, total_time, n))
+        for N in [1, 4, 16]:
+            yield ('simulate_capacity', {'N': N, 'S': 16 // N, 'simulations': n},
+                   lambda N=N, n=n: math2.simulate_capacity(N, 16 // N, 10, 8, total_time, n))
+        for processes in [1, 2] if quick else [1, 2, 4]:
+            yield ('parallel_production_capacity', {'N': 6, 's': 1, 'num_simulations': n,
+                                                    'workers': processes},
+                   lambda n=n, p=processes: parallel_mc.parallel_production_capacity(
+                       6, 1, 10, 8, total_time, n, seed=42, workers=p))
+    for w in workers:
+        yield ('cell_unit_optimization', {'max_workers': w},
+               lambda w=w: math3_2.cell_unit_optimization(w))
+        yield ('cell_series_optimization', {'max_workers': w},
+               lambda w=w: math3_2.cell_series_optimization(w))
+        yield ('cell_parallel_optimization', {'max_workers': w},
+               lambda w=w: math3_2.cell_parallel_optimization(w))
+
+def _measure(func, repeat, track_memory=True):
+    times = []
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            func()
+            times.append(time.perf_counter() - start)
+    result = {'best_s': min(times), 'mean_s': sum(times) / len(times), 'peak_mem_mb': None}
+    if track_memory:
+        # 峰值内存单独测一次，避免 tracemalloc 的开销计入耗时
+        tracemalloc.start()
+        with contextlib.redirect_stdout(io.StringIO()):
+            func()
+        result['peak_mem_mb'] = tracemalloc.get_traced_memory()[1] / 2**20
+        tracemalloc.stop()
+    return result
+
+def _key(entry):
+    return entry['name'] + json.dumps(entry['params'], sort_keys=True)
+
+def run(quick=False, repeat=3, seed=42):
+    results = []
+    for name, params, func in _cases(quick):
+        np.random.seed(seed)
+        # 子进程中的内存 tracemalloc 看不到
+        in_process = params.get('workers', 1) == 1
+        entry = {'name': name, 'params': params, **_measure(func, repeat, in_process)}
+        results.append(entry)
+        memory = f"{entry['peak_mem_mb']:>9.1f} MB" if in_process else f"{'-':>9} MB"
+        print(f"{name:<30} {json.dumps(params):<64} "
+              f"{entry['best_s'] * 1e3:>10.2f} ms {memory}")
+    return {
+        'meta': {'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'), 'python': sys.version.split()[0],
+                 'numpy': np.__version__, 'platform': platform.platform(),
+                 'cpu_count': os.cpu_count(), 'repeat': repeat},
+        'results': results,
+    }
+
+def compare(current, baseline, threshold):
+    """
+    按用例对比最短耗时，比值超过 1 + threshold 记为性能回退，返回回退列表
+    """
+    base = {_key(e): e for e in baseline['results']}
+    regressions = []
+    for entry in current['results']:
+        old = base.get(_key(entry))
+        if old is None or old['best_s'] <= 0:
+            continue
+        ratio = entry['best_s'] / old['best_s']
+        if ratio > 1 + threshold:
+            regressions.append({**entry, 'baseline_s': old['best_s'], 'ratio': ratio})
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='仿真与优化函数的性能基准')
+    parser.add_argument('--quick', action='store_true', help='只运行小规模参数')
+    parser.add_argument('--repeat', type=int, default=3, help='每个用例的重复次数')
+    parser.add_argument('--output', default='benchmark_results.json', help='结果 JSON 路径')
+    parser.add_argument('--baseline', help='基线 JSON 路径')
+    parser.add_argument('--threshold', type=float, default=0.2, help='判定回退的相对变慢比例')
+    args = parser.parse_args(argv)
+
+    current = run(args.quick, args.repeat)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(current, f, ensure_ascii=False, indent=2)
+    print(f"\n结果已写入 {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(current, baseline, args.threshold)
+        for r in regressions:
+            print(f"性能回退: {r['name']} {json.dumps(r['params'])} "
+                  f"{r['baseline_s'] * 1e3:.2f} ms -> {r['best_s'] * 1e3:.2f} ms (×{r['ratio']:.2f})")
+        if regressions:
+            return 1
+        print(f"与基线 {args.baseline} 相比无性能回退(阈值 {args.threshold:.0%})")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,141 @@
+import hashlib
+import json
+import os
+import pickle
+import sqlite3
+import time
+
+import numpy as np
+
+# 仿真模型改动后递增，使旧缓存自动失效
+CACHE_VERSION = 1
+DEFAULT_PATH = os.environ.get(
+    'MATH_SIM_CACHE', os.path.join(os.path.expanduser('~'), '.cache', 'math_sim', 'results.sqlite'))
+
+def _normalize(value):
+    # 数值统一转成 float，保证 10 与 10.0、np.int64(10) 得到相同的键
+    if isinstance(value, (bool, np.bool_)):
+        return bool(value)
+    if isinstance(value, (int, float, np.integer, np.floating)):
+        return float(value)
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return [_normalize(v) for v in value]
+    if isinstance(value, dict):
+        return {str(k): _normalize(v) for k, v in value.items()}
+    return value
+
+def make_key(name, params):
+    """
+    由函数名、规范化后的参数(含随机种子)和缓存版本计算内容寻址键
+    """
+    payload = json.dumps({'name': name, 'version': CACHE_VERSION, 'params': _normalize(params)},
+                         sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+class ResultCache:
+    """
+    基于 SQLite 的本地结果缓存
+    max_entries / max_bytes -- 条目数与总字节数上限，超出时按最近最少使用(LRU)淘汰
+    """
+
+    def __init__(self, path=DEFAULT_PATH, max_entries=10000, max_bytes=256 * 2**20):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path)
+        self._conn.execute('CREATE TABLE IF NOT EXISTS results ('
+                           'key TEXT PRIMARY KEY, value BLOB NOT NULL, '
+                           'size INTEGER NOT NULL, last_access REAL NOT NULL)')
+        self._conn.commit()
+
+    def get(self, key):
+        row = self._conn.execute('SELECT value FROM results WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            return None
+        self._conn.execute('UPDATE results SET last_access = ? WHERE key = ?', (time.time(), key))
+        self._conn.commit()
+        return pickle.loads(row[0])
+
+    def put(self, key, value):
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        self._conn.execute('INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)',
+                           (key, blob, len(blob), time.time()))
+        self._evict()
+        self._conn.commit()
+
+    def _evict(self):
+        count, total = self._conn.execute(
+            'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results').fetchone()
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+        rows = self._conn.execute('SELECT key, size FROM results ORDER BY last_access').fetchall()
+        stale = []
+        for key, size in rows[:-1]:
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            stale.append((key,))
+            count, total = count - 1, total - size
+        self._conn.executemany('DELETE FROM results WHERE key = ?', stale)
+
+    def get_or_compute(self, name, params, compute):
+        """
+        命中则直接返回缓存结果，否则调用 compute() 并写入缓存
+        """
+        key = make_key(name, params)
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        self._conn.execute('DELETE FROM results')
+        self._conn.commit()
+
+    def __len__(self):
+        return self._conn.execute('SELECT COUNT(*) FROM results').fetchone()[0]
+
+    def close(self):
+        self._conn.close()
+
+_default_cache = None
+
+def _get_cache(cache):
+    global _default_cache
+    if cache is not None:
+        return cache
+    if _default_cache is None:
+        _default_cache = ResultCache()
+    return _default_cache
+
+def cached_production_capacity(N, s, T, k, total_time, num_simulations=10000, seed=42,
+                               chunk_size=None, cache=None):
+    """
+    带缓存的 math1.simulate_production_capacity
+    seed -- 随机种子，作为键的一部分，结果由 np.random.default_rng(seed) 生成，因而可复现
+    cache -- ResultCache，默认使用 DEFAULT_PATH(可由环境变量 MATH_SIM_CACHE 指定)
+    """
+    from math1 import simulate_production_capacity
+
+    params = {'N': N, 's': s, 'T': T, 'k': k, 'total_time': total_time,
+              'num_simulations': num_simulations, 'seed': seed, 'chunk_size': chunk_size}
+    return _get_cache(cache).get_or_compute(
+        'math1.simulate_production_capacity', params,
+        lambda: simulate_production_capacity(N, s, T, k, total_time, num_simulations,
+                                             chunk_size=chunk_size,
+                                             rng=np.random.default_rng(seed)))
+
+def cached_capacity(N, S, T, k, total_time, simulations, seed=42, chunk_size=None, cache=None):
+    """
+    带缓存的 math2.simulate_capacity，返回 (平均产能, 产能标准差)，参数含义同 cached_production_capacity
+    """
+    from math2 import simulate_capacity
+
+    params = {'N': N, 'S': S, 'T': T, 'k': k, 'total_time': total_time,
+              'simulations': simulations, 'seed': seed, 'chunk_size': chunk_size}
+    return _get_cache(cache).get_or_compute(
+        'math2.simulate_capacity', params,
+        lambda: simulate_capacity(N, S, T, k, total_time, simulations, chunk_size=chunk_size,
+                                  rng=np.random.default_rng(seed)))
@@ -0,0 +1,135 @@
+"""
+统一命令行入口，每次只回答一个查询；各子命令只导入自己需要的模块，启动时不加载 pandas/matplotlib
+    python cli.py capacity 6 1 10 8                        # math1 模型，解析解
+    python cli.py capacity 2 3 10 8 --method mc --seed 42  # math1 模型，蒙特卡洛
+    python cli.py line 4 4 10 8 --simulations 1000         # math2 模型
+    python cli.py allocate parallel --max-workers 60       # math3_2 工人分配
+    python cli.py pareto --max-workers 48                  # math3_1 产能-人数 Pareto 前沿
+加 --json 输出 JSON
+"""
+import argparse
+import json
+import logging
+import sys
+
+def _to_json(value):
+    # numpy 标量转为 Python 数值
+    return value.item() if hasattr(value, 'item') else str(value)
+
+def _emit(args, result, lines):
+    if args.json:
+        print(json.dumps(result, ensure_ascii=False, default=_to_json))
+    else:
+        print('\n'.join(lines))
+
+def _capacity(args):
+    import numpy as np
+
+    if args.method == 'analytic':
+        from analytic import analytic_production_capacity
+        stats = analytic_production_capacity(args.N, args.s, args.T, args.k, args.total_time)
+    else:
+        from math1 import simulate_production_capacity
+        stats = simulate_production_capacity(args.N, args.s, args.T, args.k, args.total_time,
+                                             args.simulations, chunk_size=args.chunk_size,
+                                             rng=np.random.default_rng(args.seed),
+                                             raw_output=args.raw_output)
+    keys = ['mean', 'std', 'min', 'max', 'median', '5th_percentile', '95th_percentile']
+    _emit(args, stats, [f"{key:<16}{stats[key]:>12.2f}" for key in keys])
+
+def _line(args):
+    import numpy as np
+    from math2 import simulate_capacity
+
+    mean, std = simulate_capacity(args.N, args.S, args.T, args.k, args.total_time,
+                                  args.simulations, rng=np.random.default_rng(args.seed))
+    _emit(args, {'mean': mean, 'std': std},
+          [f"平均产能={mean:.1f}", f"标准差={std:.1f}",
+           f"单位波动产能={mean / std if std > 0 else 0:.2f}"])
+
+def _allocate(args):
+    import math3_2
+    from instrumentation import record
+
+    if not args.json:
+        logging.basicConfig(level=logging.INFO, format='%(message)s', stream=sys.stdout)
+    workload = math3_2.load_workload(args.workload)
+    optimize = {
+        'unit': math3_2.cell_unit_optimization,
+        'series': math3_2.cell_series_optimization,
+        'parallel': lambda w, workload: math3_2.cell_parallel_optimization(
+            w, args.min_processes, workload=workload),
+    }[args.structure]
+    with record(profile=args.profile) as recorder:
+        total_time, config = optimize(args.max_workers, workload=workload)
+    if args.json:
+        _emit(args, config, [])
+    if args.stats or args.profile:
+        print(recorder.report(), file=sys.stderr if args.json else sys.stdout)
+
+def _pareto(args):
+    from math3_1 import pareto_allocations
+
+    front = pareto_allocations(args.max_workers, args.beats, args.total_time)
+    rows = [{name: front[name][i] for name in front.dtype.names} for i in range(len(front))]
+    _emit(args, rows, ["   n1   n2   n3     产能  人均产能"] +
+          [f"{r['n1']:>5}{r['n2']:>5}{r['n3']:>5}{r['capacity']:>9.1f}{r['efficiency']:>10.2f}"
+           for r in rows])
+
+def build_parser():
+    parser = argparse.ArgumentParser(description='产能与工人分配查询')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    def common(p):
+        p.add_argument('--total-time', type=float, default=24 * 60, help='总生产时间(min)')
+        p.add_argument('--json', action='store_true', help='以 JSON 输出')
+
+    p = sub.add_parser('capacity', help='N 条线 × s 个工位的产能统计(math1 模型)')
+    p.add_argument('N', type=int, help='生产线数量')
+    p.add_argument('s', type=int, help='每条生产线的工位数')
+    p.add_argument('T', type=float, help='产品总平均完成时间(min)')
+    p.add_argument('k', type=float, help='熟练程度系数')
+    p.add_argument('--method', choices=['analytic', 'mc'], default='analytic',
+                   help='analytic 为解析解，mc 为蒙特卡洛仿真')
+    p.add_argument('--simulations', type=int, default=10000, help='仿真次数(mc)')
+    p.add_argument('--chunk-size', type=int, help='流式仿真的批大小(mc)')
+    p.add_argument('--seed', type=int, help='随机种子(mc)')
+    p.add_argument('--raw-output', help='原始样本输出目录(mc)，见 storage')
+    common(p)
+    p.set_defaults(func=_capacity)
+
+    p = sub.add_parser('line', help='N 条线 × S 个工序的产能均值与标准差(math2 模型)')
+    p.add_argument('N', type=int, help='生产线数量')
+    p.add_argument('S', type=int, help='每条生产线的工序数')
+    p.add_argument('T', type=float, help='总平均完成时间(min)')
+    p.add_argument('k', type=float, help='熟练程度系数')
+    p.add_argument('--simulations', type=int, default=1000, help='仿真次数')
+    p.add_argument('--seed', type=int, help='随机种子')
+    common(p)
+    p.set_defaults(func=_line)
+
+    p = sub.add_parser('allocate', help='CELL 结构的最优工人分配(math3_2)')
+    p.add_argument('structure', choices=['unit', 'series', 'parallel'])
+    p.add_argument('--max-workers', type=int, default=48, help='总工人数')
+    p.add_argument('--min-processes', type=int, default=2, help='混联型每条线的最少工序数')
+    p.add_argument('--workload', help='工作量 CSV，格式见 math3_2.load_workload')
+    p.add_argument('--stats', action='store_true', help='输出各搜索阶段的候选数、改进次数与耗时')
+    p.add_argument('--profile', action='store_true', help='同时输出 cProfile 剖析结果')
+    p.add_argument('--json', action='store_true', help='以 JSON 输出')
+    p.set_defaults(func=_allocate)
+
+    p = sub.add_parser('pareto', help='三阶段产能与人数的 Pareto 最优分配(math3_1)')
+    p.add_argument('--max-workers', type=int, default=48, help='最大可用工人数')
+    p.add_argument('--beats', type=float, nargs=3, default=[96, 64, 64],
+                   help='组装、测试、包装节拍时间(分钟/件)')
+    common(p)
+    p.set_defaults(func=_pareto)
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    args.func(args)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,78 @@
+import numpy as np
+
+from math1 import _distribution_params, _step_time_range, _summarize
+
+def departure_times(service, buffers=None):
+    """
+    串联生产线的离开时间(max-plus 递推)，原料在 0 时刻起始终充足
+    service -- 服务时间，形状 (..., 产品数, 工位数)，前面的维度为相互独立的生产线
+    buffers -- 相邻工位间的缓冲容量，None 为无限缓冲；标量或长度为 工位数-1 的序列
+    返回与 service 同形状的离开时间 D[..., i, j]
+
+    无限缓冲: D[i,j] = max(D[i-1,j], D[i,j-1]) + S[i,j]，对每个工位沿产品方向有闭式解
+        D[:,j] = C + cummax(D[:,j-1] - C + S)，C 为 S[:,j] 的累加和
+    有限缓冲(加工后阻塞): 产品 i 须等产品 i-b-1 离开下一工位才能离开本工位
+        D[i,j] = max(max(D[i-1,j], D[i,j-1]) + S[i,j], D[i-b-1,j+1])
+        所需的上一产品和阻塞项均已知，对每个产品沿工位方向同样是累加最大值的闭式解
+    """
+    service = np.asarray(service, dtype=float)
+    n_items, n_stations = service.shape[-2:]
+    D = np.empty_like(service)
+
+    if buffers is None:
+        arrival = np.zeros(service.shape[:-1])
+        for j in range(n_stations):
+            S = service[..., j]
+            C = np.cumsum(S, axis=-1)
+            D[..., j] = C + np.maximum.accumulate(arrival + S - C, axis=-1)
+            arrival = D[..., j]
+        return D
+
+    buffers = np.broadcast_to(np.asarray(buffers, dtype=int), (n_stations - 1,))
+    downstream = np.arange(1, n_stations)
+    C = np.cumsum(service, axis=-1)
+    blocked = np.full(service.shape[:-2] + (n_stations,), -np.inf)
+    previous = np.zeros(service.shape[:-2] + (n_stations,))
+    for i in range(n_items):
+        S = service[..., i, :]
+        # 阻塞项: 最后一个工位不受阻塞
+        lag = i - buffers - 1
+        active = lag >= 0
+        blocked[..., :-1][..., active] = D[..., lag[active], downstream[active]]
+        Y = np.maximum(previous + S, blocked)
+        # D[j] = max(D[j-1] + S[j], Y[j]) => D - C = cummax(Y - C)
+        D[..., i, :] = C[..., i, :] + np.maximum.accumulate(Y - C[..., i, :], axis=-1)
+        previous = D[..., i, :]
+    return D
+
+def simulate_line_des(N, s, T, k, total_time, num_simulations=1000, buffer_size=None,
+                      rng=None, max_elements=2**23):
+    """
+    逐件仿真的产能模型: 每件产品在每个工位的时间独立服从 U(low, high)(与 math1 相同)，
+    产能为 total_time 内最后一个工位完成的产品数，计入开工爬坡、阻塞与等待
+    N -- 生产线数量
+    s -- 每条生产线的工位数
+    T -- 产品总平均完成时间(min)
+    k -- 熟练程度系数
+    total_time -- 总生产时间(min)
+    num_simulations -- 仿真次数
+    buffer_size -- 工位间缓冲容量，None 为无限缓冲
+    rng -- 随机数生成器，默认使用全局 np.random
+    max_elements -- 单批服务时间数组的元素上限
+    返回与 math1.simulate_production_capacity 相同结构的统计结果字典
+    """
+    rng = np.random if rng is None else rng
+    low, high = _step_time_range(s, T, k, '逐件仿真')
+
+    # 最后一个工位相邻两次离开至少间隔 low，total_time 内完成数不超过 total_time / low
+    n_items = int(total_time // low) + 1
+    lines = num_simulations * N
+    step = max(1, max_elements // (n_items * s))
+    completed = np.empty(lines)
+    for start in range(0, lines, step):
+        n = min(step, lines - start)
+        service = rng.uniform(low, high, size=(n, n_items, s))
+        D = departure_times(service, buffer_size)
+        completed[start:start + n] = np.sum(D[..., -1] <= total_time, axis=-1)
+    total_capacities = completed.reshape(num_simulations, N).sum(axis=1)
+    return _summarize(total_capacities, _distribution_params(s, T, k))
@@ -0,0 +1,170 @@
+import numpy as np
+
+MODELS = ('math1', 'math2')
+
+def _half_widths(k, t_mean, model):
+    # 各工人工位时间 U(t_mean - c, t_mean + c) 的半宽，model 决定 k 的含义(与 math1 / math2 一致)
+    k = np.asarray(k, dtype=float)
+    if model == 'math1':
+        return np.sqrt(3) * t_mean / k
+    if model == 'math2':
+        return t_mean / k
+    raise ValueError(f"未知的模型: {model}，可选 {MODELS}")
+
+def _line_capacities(c, u, t_mean, total_time, model):
+    # c -- 各工位工人的半宽 (..., s)；u -- 标准均匀数 (..., s)；返回生产线产能 (...)
+    cycle = np.max(t_mean + c * (2 * u - 1), axis=-1)
+    capacity = total_time / cycle
+    return np.floor(capacity) if model == 'math2' else capacity
+
+def assignment_from_matrix(matrix, N, s):
+    """
+    0/1 分配矩阵转为工人下标数组
+    matrix -- 形状 (工人数, N*s)，第 j 列对应第 j // s 条生产线的第 j % s 个工位
+    每个工位恰有一名工人、每名工人至多一个工位，返回形状 (N, s) 的工人下标
+    """
+    matrix = np.asarray(matrix)
+    if matrix.ndim != 2 or matrix.shape[1] != N * s:
+        raise ValueError(f"分配矩阵须为 (工人数, {N * s})")
+    if np.any(matrix.sum(axis=0) != 1) or np.any(matrix.sum(axis=1) > 1):
+        raise ValueError("每个工位须恰有一名工人，每名工人至多一个工位")
+    return matrix.argmax(axis=0).reshape(N, s)
+
+def evaluate_assignments(assignments, k, T, total_time, num_simulations=2000, model='math1',
+                         u=None, rng=None, max_elements=2**24):
+    """
+    批量评估多个分配方案的产能
+    assignments -- 工人下标，形状 (N, s) 或 (候选数, N, s)，N 条生产线 × s 个工位
+    k -- 各工人的熟练程度系数，长度为工人数
+    T -- 产品总平均完成时间(min)，工位平均时间为 T / s
+    total_time -- 总生产时间(min)
+    model -- 'math1'(产能 total_time / 节拍，U(t ± sqrt(3)t/k)) 或 'math2'(产能向下取整，U(t ± t/k))
+    u -- 标准均匀数 (num_simulations, N, s)；所有候选共用同一批(公共随机数)，候选间的
+         比较不受抽样噪声的独立波动影响。默认由 rng 生成
+    rng -- 随机数生成器，默认使用全局 np.random
+    max_elements -- 单次向量化计算的数组元素上限
+    返回 (平均产能, 产能标准差)，每个候选一个值；单个方案时为标量
+    """
+    assignments = np.asarray(assignments, dtype=int)
+    single = assignments.ndim == 2
+    assignments = assignments.reshape((-1,) + assignments.shape[-2:])
+    B, N, s = assignments.shape
+    if u is None:
+        u = (np.random if rng is None else rng).random((num_simulations, N, s))
+    c = _half_widths(k, T / s, model)[assignments]
+
+    means, stds = np.empty(B), np.empty(B)
+    step = max(1, max_elements // u.size)
+    for start in range(0, B, step):
+        block = c[start:start + step, None]
+        totals = _line_capacities(block, u, T / s, total_time, model).sum(axis=-1)
+        means[start:start + step] = totals.mean(axis=1)
+        stds[start:start + step] = totals.std(axis=1)
+    return (means[0], stds[0]) if single else (means, stds)
+
+def _initial_assignment(k, N, s):
+    # 按熟练度从高到低依次填满各生产线: 节拍由线内最慢者决定，把慢的工人集中在同一条线上损失最小
+    order = np.argsort(-np.asarray(k, dtype=float), kind='stable')
+    return order[:N * s].reshape(N, s)
+
+def _leave_one_out_max(times):
+    # 沿最后一维去掉每个位置后的最大值
+    lead = np.full(times.shape[:-1] + (1,), -np.inf)
+    before = np.concatenate([lead, np.maximum.accumulate(times, axis=-1)[..., :-1]], axis=-1)
+    after = np.maximum.accumulate(times[..., ::-1], axis=-1)[..., ::-1]
+    after = np.concatenate([after[..., 1:], lead], axis=-1)
+    return np.maximum(before, after)
+
+def _replacement_means(others, u, line, slot, c_new, t_mean, total_time, model, max_elements):
+    """
+    把生产线 line 的工位 slot 换成半宽为 c_new 的工人后该线的平均产能(每个候选一个值)
+    others -- 各线去掉每个工位后其余工位的最大时间 (n, N, s)，新节拍 = max(others, 新工位时间)
+    """
+    means = np.empty(len(line))
+    step = max(1, max_elements // len(u))
+    for start in range(0, len(line), step):
+        l, j = line[start:start + step], slot[start:start + step]
+        new_time = t_mean + c_new[start:start + step] * (2 * u[:, l, j] - 1)
+        capacity = total_time / np.maximum(others[:, l, j], new_time)
+        if model == 'math2':
+            capacity = np.floor(capacity)
+        means[start:start + step] = capacity.mean(axis=0)
+    return means
+
+def optimize_assignment(k, N, s, T, total_time, num_simulations=2000, model='math1', initial=None,
+                        max_rounds=200, rng=None, max_elements=2**24):
+    """
+    搜索期望产能最大的工人分配(工人数可多于工位数，多出的工人不上岗)
+    k, T, total_time, model -- 同 evaluate_assignments
+    initial -- 初始分配 (N, s)；默认按熟练度从高到低依次填满各生产线
+    目标为固定一批公共随机数下的样本平均产能。期望产能是各生产线期望产能之和，
+    交换只改变所涉及的一两条线中的一个工位，借助各线去掉每个工位后的最大时间，
+    每个候选的评估量与工位数无关。每轮把所有跨线交换与上岗/替补交换一次性批量评估，
+    执行改进最大的一个，直到没有改进或达到 max_rounds。
+    目标不可按工位拆分(节拍取最大值)，匈牙利算法不适用，因此采用交换邻域的局部搜索。
+    结束后用一批新的随机数重新评估，避免在同一批样本上选优带来的偏高
+    返回字典: assignment、mean、std(新样本上的产能)、objective / initial_objective
+    (搜索样本上的平均产能)、rounds、evaluations(评估过的候选交换数)
+    """
+    rng = np.random if rng is None else rng
+    k = np.asarray(k, dtype=float)
+    if len(k) < N * s:
+        raise ValueError(f"工人数 {len(k)} 少于工位数 {N * s}")
+    t_mean = T / s
+    c = _half_widths(k, t_mean, model)
+    u = rng.random((num_simulations, N, s))
+
+    lines = (_initial_assignment(k, N, s) if initial is None
+             else np.array(initial, dtype=int).reshape(N, s))
+    if len(np.unique(lines)) != N * s:
+        raise ValueError("初始分配中有工人被重复分配")
+    times = t_mean + c[lines] * (2 * u - 1)
+    line_means = _line_capacities(c[lines], u, t_mean, total_time, model).mean(axis=0)
+    initial_objective = line_means.sum()
+
+    pos_line, pos_slot = np.divmod(np.arange(N * s), s)
+    p, q = np.triu_indices(N * s, 1)
+    cross = pos_line[p] != pos_line[q]
+    p, q = p[cross], q[cross]
+    evaluations = 0
+    rounds = 0
+    for rounds in range(1, max_rounds + 1):
+        flat = lines.ravel()
+        bench = np.setdiff1d(np.arange(len(k)), flat)
+        others = _leave_one_out_max(times)
+
+        # 跨线交换 p <-> q 改变两条线各一个工位；上岗/替补交换把工位 r 换成替补工人 b
+        r, b = np.repeat(np.arange(N * s), len(bench)), np.tile(bench, N * s)
+        position = np.concatenate([p, q, r])
+        worker = np.concatenate([flat[q], flat[p], b])
+        means = _replacement_means(others, u, pos_line[position], pos_slot[position], c[worker],
+                                   t_mean, total_time, model, max_elements)
+        evaluations += len(position)
+        m_p, m_q, m_r = np.split(means, [len(p), 2 * len(p)])
+        gains = np.concatenate([m_p + m_q - line_means[pos_line[p]] - line_means[pos_line[q]],
+                                m_r - line_means[pos_line[r]]])
+        if len(gains) == 0 or gains.max() <= 1e-12 * abs(line_means.sum()):
+            break
+        best = int(np.argmax(gains))
+        if best < len(p):
+            moves = [(p[best], flat[q[best]], m_p[best]), (q[best], flat[p[best]], m_q[best])]
+        else:
+            best -= len(p)
+            moves = [(r[best], b[best], m_r[best])]
+        for pos, new_worker, new_mean in moves:
+            l, j = pos_line[pos], pos_slot[pos]
+            lines[l, j] = new_worker
+            times[:, l, j] = t_mean + c[new_worker] * (2 * u[:, l, j] - 1)
+            line_means[l] = new_mean
+
+    mean, std = evaluate_assignments(lines, k, T, total_time, num_simulations, model, rng=rng,
+                                     max_elements=max_elements)
+    return {
+        'assignment': lines,
+        'mean': mean,
+        'std': std,
+        'objective': line_means.sum(),
+        'initial_objective': initial_objective,
+        'rounds': rounds,
+        'evaluations': evaluations,
+    }
@@ -0,0 +1,115 @@
+"""
+优化过程的计数、计时与性能剖析
+默认不记录，求解函数中的探针只做一次空判断；在 record() 范围内运行时按搜索阶段累计
+    with record() as rec:
+        cell_parallel_optimization(48)
+    print(rec.report())
+"""
+import cProfile
+import contextlib
+import functools
+import io
+import pstats
+import time
+from contextvars import ContextVar
+
+COUNTERS = ('candidates', 'improvements', 'space')
+
+_active = ContextVar('instrumentation_recorder', default=None)
+
+class Recorder:
+    """
+    phases -- {阶段名: {'calls', 'candidates', 'improvements', 'space', 'elapsed'}}
+        candidates -- 评估过的候选(可行性判定、调动等)次数
+        improvements -- 使目标变好的次数
+        space -- 逐一枚举时的候选总数，1 - candidates / space 即剪枝率
+    callback(event) -- 每个阶段结束时调用，event 为含 phase、各计数、elapsed 及附加字段的字典
+    profile -- record(profile=True) 时为 pstats.Stats
+    """
+
+    def __init__(self, callback=None):
+        self.phases = {}
+        self.callback = callback
+        self.profile = None
+
+    def add(self, phase, elapsed=0.0, **fields):
+        stats = self.phases.setdefault(phase, dict(calls=0, elapsed=0.0, **{c: 0 for c in COUNTERS}))
+        stats['calls'] += 1
+        stats['elapsed'] += elapsed
+        for name in COUNTERS:
+            stats[name] += fields.get(name, 0)
+        if self.callback is not None:
+            self.callback({'phase': phase, 'elapsed': elapsed, **fields})
+
+    @contextlib.contextmanager
+    def phase(self, name, **fields):
+        counts = dict(fields, **{c: fields.get(c, 0) for c in COUNTERS})
+        start = time.perf_counter()
+        try:
+            yield counts
+        finally:
+            self.add(name, time.perf_counter() - start, **counts)
+
+    def report(self, profile_lines=20):
+        """
+        返回各阶段统计表；有剖析结果时附上按累计时间排序的前 profile_lines 行
+        """
+        # 表头每个汉字占两列，按显示宽度对齐
+        lines = ['阶段' + ' ' * 22 + '    次数      候选    改进    剪枝率    耗时(ms)']
+        for name, s in self.phases.items():
+            pruned = f"{1 - s['candidates'] / s['space']:.2%}" if s['space'] else '-'
+            lines.append(f"{name:<26}{s['calls']:>8}{s['candidates']:>10}{s['improvements']:>8}"
+                         f"{pruned:>10}{s['elapsed'] * 1e3:>12.3f}")
+        if self.profile is not None:
+            out = io.StringIO()
+            self.profile.stream = out
+            self.profile.sort_stats('cumulative').print_stats(profile_lines)
+            lines.append(out.getvalue())
+        return '\n'.join(lines)
+
+def current():
+    return _active.get()
+
+def phase(name, **fields):
+    """
+    求解函数中的探针: with phase('minimax.bisection') as probe: probe['candidates'] += 1
+    未启用记录时返回一次性的计数字典，不计时
+    """
+    recorder = _active.get()
+    if recorder is None:
+        return contextlib.nullcontext(dict.fromkeys(COUNTERS, 0))
+    return recorder.phase(name, **fields)
+
+@contextlib.contextmanager
+def record(callback=None, profile=False):
+    """
+    在该范围内启用记录，产出 Recorder
+    callback -- 阶段事件回调，见 Recorder
+    profile -- 同时用 cProfile 剖析，结果存入 Recorder.profile
+    """
+    recorder = Recorder(callback)
+    token = _active.set(recorder)
+    profiler = cProfile.Profile() if profile else None
+    if profiler is not None:
+        profiler.enable()
+    try:
+        yield recorder
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            recorder.profile = pstats.Stats(profiler)
+        _active.reset(token)
+
+def timed(name):
+    """
+    装饰器: 把整个函数作为一个阶段计时，未启用记录时只多一次空判断
+    """
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _active.get() is None:
+                return func(*args, **kwargs)
+            with phase(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
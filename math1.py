@@ -1,9 +1,8 @@
 import numpy as np
-import pandas as pd
-from scipy.stats import uniform
-import matplotlib.pyplot as plt
+from streaming import RunningMoments, QuantileSketch
 
-def simulate_production_capacity(N, s, T, k, total_time, num_simulations=10000):
+def simulate_production_capacity(N, s, T, k, total_time, num_simulations=10000,
+                                 chunk_size=None, rng=None, raw_output=None):
     """
     N -- 生产线数量
     s -- 每条生产线的工位数
@@ -11,19 +10,34 @@ def simulate_production_capacity(N, s, T, k, total_time, num_simulations=10000):
     k -- 熟练程度系数
     total_time -- 总生产时间(min)
     num_simulations -- 仿真次数
+    chunk_size -- 流式模式每批仿真次数；默认一次性生成全部样本。给出时按批生成，
+                  均值/方差/极值在线累计，分位数由固定区间直方图草图估计，内存为 O(chunk_size)
+    rng -- 随机数生成器，默认使用全局 np.random
+    raw_output -- 原始样本输出目录；给出时把每次仿真的总产能与各生产线节拍以 float32
+                  写入内存映射 .npy 文件(流式模式下分批写入)，之后可用 storage.load_samples 读取
     """
-    # 每个工序的理论平均时间
-    t_mean = T / s
-    
-    # S = (t_mean/k)^2
-    # 对于 U(a,b)，S = (b-a)^2/12
-    # (b-a)^2/12 = (t_mean/k)^2 => (b-a) = 2*sqrt(3)*t_mean/k
-    c = np.sqrt(3) * t_mean / k     # 半宽
-    low = t_mean - c
-    high = t_mean + c
+    rng = np.random if rng is None else rng
+
+    low, high = _step_time_range(s, T, k, None if chunk_size is None else '流式模式')
+    distribution_params = _distribution_params(s, T, k)
+    writer = None
+    if raw_output is not None:
+        from storage import SampleWriter
+        writer = SampleWriter(raw_output, num_simulations, N,
+                              params={'N': N, 's': s, 'T': T, 'k': k, 'total_time': total_time,
+                                      **distribution_params})
+
+    if chunk_size is not None:
+        try:
+            moments, sketch = _stream_production_capacity(N, s, low, high, total_time,
+                                                          num_simulations, chunk_size, rng, writer)
+        finally:
+            if writer is not None:
+                writer.close()
+        return _summarize((moments, sketch), distribution_params)
     
     # 工位时间
-    process_times = np.random.uniform(low, high, size=(num_simulations, N, s))
+    process_times = rng.uniform(low, high, size=(num_simulations, N, s))
     
     # 每条生产线的节拍(最慢工位时间)
     cycle_times = np.max(process_times, axis=2) 
@@ -33,20 +47,156 @@ def simulate_production_capacity(N, s, T, k, total_time, num_simulations=10000):
     
     # 总产能
     total_capacities = np.sum(line_capacities, axis=1) 
+
+    if writer is not None:
+        with writer:
+            writer.write(0, cycle_times, total_capacities)
     
-    return {
-        'mean': np.mean(total_capacities),
-        'std': np.std(total_capacities),
-        'min': np.min(total_capacities),
-        'max': np.max(total_capacities),
-        'median': np.median(total_capacities),
-        '5th_percentile': np.percentile(total_capacities, 5),
-        '95th_percentile': np.percentile(total_capacities, 95),
-        'distribution_params': {'low': low, 'high': high, 'mean': t_mean}
+    return _summarize(total_capacities, distribution_params)
+
+def _step_time_range(s, T, k, mode=None):
+    """
+    每个工位的时间 U(low, high)，返回 (low, high)；s, T, k 可以是数组
+    mode -- 要求下限为正的计算方式(如 '流式模式')，给出且 low <= 0 时抛出 ValueError
+    """
+    # 每个工序的理论平均时间
+    t_mean = T / s
+    
+    # S = (t_mean/k)^2
+    # 对于 U(a,b)，S = (b-a)^2/12
+    # (b-a)^2/12 = (t_mean/k)^2 => (b-a) = 2*sqrt(3)*t_mean/k
+    c = np.sqrt(3) * t_mean / k     # 半宽
+    low = t_mean - c
+    high = t_mean + c
+    if mode is not None and np.any(low <= 0):
+        raise ValueError(f"{mode}要求工位时间下限为正(k > sqrt(3))")
+    return low, high
+
+def _distribution_params(s, T, k):
+    # 结果字典中的 distribution_params
+    low, high = _step_time_range(s, T, k)
+    return {'low': low, 'high': high, 'mean': T / s}
+
+def _summary(mean, std, minimum, maximum, median, p5, p95, distribution_params=None):
+    """
+    各计算引擎共用的统计结果字典，键与 simulate_production_capacity 的返回值一致
+    distribution_params 为 None 时不含该键
+    """
+    result = {
+        'mean': mean,
+        'std': std,
+        'min': minimum,
+        'max': maximum,
+        'median': median,
+        '5th_percentile': p5,
+        '95th_percentile': p95,
     }
+    if distribution_params is not None:
+        result['distribution_params'] = distribution_params
+    return result
+
+def _summarize(samples, distribution_params=None):
+    """
+    samples -- 总产能样本数组，或流式累计的 (RunningMoments, QuantileSketch)
+    """
+    if isinstance(samples, tuple):
+        moments, sketch = samples
+        median, p5, p95 = sketch.percentile([50, 5, 95])
+        return _summary(moments.mean, moments.std, moments.min, moments.max, median, p5, p95,
+                        distribution_params)
+    return _summary(np.mean(samples), np.std(samples), np.min(samples), np.max(samples),
+                    np.median(samples), np.percentile(samples, 5), np.percentile(samples, 95),
+                    distribution_params)
+
+def _sample_cycle_times(N, s, low, high, n, rng):
+    # n 次仿真各生产线的节拍，工位时间 U(low, high)
+    return np.max(rng.uniform(low, high, size=(n, N, s)), axis=2)
 
-def plot_results(df):
-    plt.figure(figsize=(15, 8))
+def _sample_total_capacities(N, s, low, high, total_time, n, rng):
+    # n 次仿真的总产能
+    return np.sum(total_time / _sample_cycle_times(N, s, low, high, n, rng), axis=1)
+
+def _stream_production_capacity(N, s, low, high, total_time, num_simulations, chunk_size, rng,
+                                writer=None):
+    """
+    按批仿真总产能，返回 (RunningMoments, QuantileSketch)
+    草图区间取总产能的理论范围 [N*total_time/high, N*total_time/low]
+    writer -- storage.SampleWriter，给出时逐批写入原始样本
+    调用方须保证 low > 0，见 _step_time_range(mode=...)
+    """
+    moments = RunningMoments()
+    sketch = QuantileSketch(N * total_time / high, N * total_time / low)
+    chunk_size = max(1, int(chunk_size))
+    for start in range(0, num_simulations, chunk_size):
+        n = min(chunk_size, num_simulations - start)
+        cycle_times = _sample_cycle_times(N, s, low, high, n, rng)
+        total_capacities = np.sum(total_time / cycle_times, axis=1)
+        if writer is not None:
+            writer.write(start, cycle_times, total_capacities)
+        moments.update(total_capacities)
+        sketch.update(total_capacities)
+    return moments, sketch
+
+def simulate_capacity_sweep(N, s, T, k, total_time, num_simulations=10000, rng=None,
+                            max_elements=2**24):
+    """
+    批量仿真多组 (N, s, T, k, total_time) 参数，返回每组参数一行的统计结果表
+    N, s, T, k, total_time -- 标量或数组，按 numpy 规则广播成参数组合
+    num_simulations -- 每组参数的仿真次数
+    rng -- 随机数生成器，默认使用全局 np.random
+    max_elements -- 单次向量化计算(含均匀数抽样)的数组元素上限，控制内存占用；
+                    另需保存每组 s 的 (num_simulations, 最大生产线数) 节拍样本
+    工位时间 U(low, high) = low + (high - low) * U(0, 1) 关于标准均匀数单调，
+    故节拍 max(工位时间) = low + (high - low) * max(U(0, 1))。工序数 s 相同的参数组
+    共用同一批标准均匀数(公共随机数)，每组参数的边际分布与单独仿真完全一致
+    """
+    import pandas as pd
+
+    rng = np.random if rng is None else rng
+    N, s, T, k, total_time = (np.ravel(v) for v in np.broadcast_arrays(N, s, T, k, total_time))
+    params = pd.DataFrame({'N': N.astype(int), 's': s.astype(int), 'T': T.astype(float),
+                           'k': k.astype(float), 'total_time': total_time.astype(float)})
+    params['low'], params['high'] = _step_time_range(params['s'], params['T'], params['k'])
+
+    stat_names = ['mean', 'std', 'min', 'max', 'median', '5th_percentile', '95th_percentile']
+    stats = np.empty((len(params), len(stat_names)))
+    for s_value, group in params.groupby('s', sort=False):
+        # 每条生产线节拍对应的标准均匀数最大值，形状 (num_simulations, 最大生产线数)
+        n_max = group['N'].max()
+        u_max = np.empty((num_simulations, n_max))
+        # 按仿真次数分批抽样，单批 (批大小, n_max, s) 不超过 max_elements；依次抽取与一次抽取的随机数序列相同
+        batch = max(1, max_elements // (n_max * s_value))
+        for start in range(0, num_simulations, batch):
+            u_max[start:start + batch] = rng.random(
+                (min(batch, num_simulations - start), n_max, s_value)).max(axis=2)
+        for N_value, sub in group.groupby('N', sort=False):
+            u = u_max[:, :N_value]
+            step = max(1, max_elements // u.size)
+            for start in range(0, len(sub), step):
+                rows = sub.iloc[start:start + step]
+                low = rows['low'].to_numpy()[:, None, None]
+                width = (rows['high'] - rows['low']).to_numpy()[:, None, None]
+                cycle_times = low + width * u
+                total_capacities = np.sum(rows['total_time'].to_numpy()[:, None, None] / cycle_times, axis=2)
+                median, p5, p95 = np.percentile(total_capacities, [50, 5, 95], axis=1)
+                stats[rows.index] = np.column_stack([
+                    total_capacities.mean(axis=1), total_capacities.std(axis=1),
+                    total_capacities.min(axis=1), total_capacities.max(axis=1),
+                    median, p5, p95])
+
+    for j, name in enumerate(stat_names):
+        params[name] = stats[:, j]
+    return params
+
+def plot_results(df, output='production_capacity_analysis.png', show=None):
+    """
+    output -- 图片保存路径，None 不保存
+    show -- 是否弹出窗口，None 时仅在交互式后端下显示(见 plotting.finish)
+    """
+    import matplotlib.pyplot as plt
+    from plotting import finish
+
+    fig = plt.figure(figsize=(15, 8))
     
     for i, struct in enumerate(df['结构类型'].unique(), 1):
         plt.subplot(1, 3, i)
@@ -66,11 +216,12 @@ def plot_results(df):
         plt.grid(True, linestyle='--', alpha=0.6)
     
     plt.tight_layout()
-    plt.savefig('production_capacity_analysis.png')
-    plt.show()
+    finish(fig, output, show)
 
 
 if __name__ == '__main__':
+    import pandas as pd
+
     # 此处我们固定随机种子以供评委老师复现
     np.random.seed(42)
     
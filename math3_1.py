@@ -1,4 +1,3 @@
-import matplotlib.pyplot as plt
 import numpy as np
 
 # Constants
@@ -6,102 +5,154 @@ total_time = 24 * 60    # 每天总工作分钟数
 beat_A1 = [96, 64, 64]  # 组装、测试、包装节拍时间(分钟/件)
 max_workers = 48        # 最大可用工人数
 
-
-k = max_workers // (3 + 2 + 2)  # 3:2:2比例，7k ≤ 48
-n1_opt = 3 * k                  # 组装工人数
-n2_opt = 2 * k                  # 测试工人数
-n3_opt = 2 * k                  # 包装工人数
-
-# 产能
-capacity1 = n1_opt * total_time / beat_A1[0]
-capacity2 = n2_opt * total_time / beat_A1[1]
-capacity3 = n3_opt * total_time / beat_A1[2]
-total_capacity = min(capacity1, capacity2, capacity3)
-efficiency = total_capacity / (n1_opt + n2_opt + n3_opt)
-
-print("最优工人分配(3:2:2比例方法):")
-print(f"  组装工人: {n1_opt}")
-print(f"  测试工人: {n2_opt}")
-print(f"  包装工人: {n3_opt}")
-print(f"  总工人数: {n1_opt + n2_opt + n3_opt}")
-print(f"  日产能: {total_capacity:.0f} 件")
-print(f"  效率: {efficiency:.2f} 件/工人/天")
-
-
-worker_range = range(1, max_workers)
-allocations = []
-efficiencies = []
-capacities = []
-
-for n1 in worker_range:
-    for n2 in worker_range:
-        n3 = max_workers - n1 - n2
-        if n3 < 1:
-            continue
-        
-        c1 = n1 * total_time / beat_A1[0]
-        c2 = n2 * total_time / beat_A1[1]
-        c3 = n3 * total_time / beat_A1[2]
-        total_cap = min(c1, c2, c3)
-        eff = total_cap / (n1 + n2 + n3)
-        
-        allocations.append((n1, n2, n3))
-        efficiencies.append(eff)
-        capacities.append((c1, c2, c3))
-
-plt.figure(figsize=(18, 12))
-
-plt.subplot(2, 2, 1)
-n1_values = [a[0] for a in allocations]
-n2_values = [a[1] for a in allocations]
-sc = plt.scatter(n1_values, n2_values, c=efficiencies, cmap='viridis', alpha=0.7)
-plt.colorbar(sc, label='Efficiency (units/worker/day)')
-plt.plot(n1_opt, n2_opt, 'ro', markersize=10, label='Optimal (3:2:2 ratio)')
-plt.xlabel('Assembly Workers (n1)')
-plt.ylabel('Testing Workers (n2)')
-plt.title('Worker Allocation Efficiency Map\n(Color shows efficiency)')
-plt.legend()
-plt.grid(True)
-
-plt.subplot(2, 2, 2)
-plt.plot([c[0] for c in capacities], label='Assembly Capacity', alpha=0.7)
-plt.plot([c[1] for c in capacities], label='Testing Capacity', alpha=0.7)
-plt.plot([c[2] for c in capacities], label='Packaging Capacity', alpha=0.7)
-plt.axhline(y=total_capacity, color='r', linestyle='--', 
-            label=f'Optimal Capacity: {total_capacity:.0f}')
-plt.xlabel('Allocation Scheme Index')
-plt.ylabel('Daily Capacity (units)')
-plt.title('Capacity Comparison Across Stages')
-plt.legend()
-plt.grid(True)
-
-plt.subplot(2, 2, 3)
-stages = ['Assembly', 'Testing', 'Packaging']
-workers = [n1_opt, n2_opt, n3_opt]
-opt_capacities = [capacity1, capacity2, capacity3]
-
-bars = plt.bar(stages, workers, alpha=0.6, label='Workers')
-plt.xlabel('Production Stage')
-plt.ylabel('Number of Workers')
-plt.title('Optimal Worker Allocation (3:2:2 Ratio)')
-
-for i, bar in enumerate(bars):
-    height = bar.get_height()
-    plt.text(bar.get_x() + bar.get_width()/2., height,
-             f'{workers[i]} workers\n{opt_capacities[i]:.0f} units',
-             ha='center', va='bottom')
-
-plt.grid(True, axis='y')
-
-plt.subplot(2, 2, 4)
-plt.hist(efficiencies, bins=30, edgecolor='black', alpha=0.7)
-plt.axvline(efficiency, color='r', linestyle='dashed', linewidth=2,
-            label=f'Optimal: {efficiency:.2f}')
-plt.xlabel('Efficiency (units/worker/day)')
-plt.ylabel('Number of Allocation Schemes')
-plt.title('Efficiency Distribution of All Possible Allocations')
-plt.legend()
-plt.grid(True)
-
-plt.tight_layout()
-plt.show()
\ No newline at end of file
+ALLOCATION_DTYPE = [('n1', int), ('n2', int), ('n3', int),
+                    ('c1', float), ('c2', float), ('c3', float),
+                    ('capacity', float), ('efficiency', float)]
+
+def evaluate_allocations(max_workers=max_workers, beats=beat_A1, total_time=total_time):
+    """
+    枚举全部分配 n1 + n2 + n3 = max_workers(各阶段至少 1 人)，返回结构化数组
+    字段: n1, n2, n3, 各阶段产能 c1, c2, c3, 系统产能 capacity, 人均产能 efficiency
+    顺序与按 n1、n2 两层循环枚举一致
+    """
+    n = np.arange(1, max_workers)
+    n1, n2 = (a.ravel() for a in np.meshgrid(n, n, indexing='ij'))
+    n3 = max_workers - n1 - n2
+    keep = n3 >= 1
+    n1, n2, n3 = n1[keep], n2[keep], n3[keep]
+
+    result = np.empty(len(n1), dtype=ALLOCATION_DTYPE)
+    result['n1'], result['n2'], result['n3'] = n1, n2, n3
+    result['c1'] = n1 * total_time / beats[0]
+    result['c2'] = n2 * total_time / beats[1]
+    result['c3'] = n3 * total_time / beats[2]
+    result['capacity'] = np.minimum(np.minimum(result['c1'], result['c2']), result['c3'])
+    result['efficiency'] = result['capacity'] / (n1 + n2 + n3)
+    return result
+
+def pareto_allocations(max_workers=max_workers, beats=beat_A1, total_time=total_time):
+    """
+    总人数不超过 max_workers 时，产能与人数的 Pareto 最优分配(人数更少或产能更高者不被支配)
+    系统产能只可能取某阶段的产能 n * total_time / beat，对每个候选产能 C，
+    各阶段所需最少人数为 ceil(C * beat / total_time)，其和即达到 C 的最少总人数；
+    每个总人数只保留产能最高的分配。计算量为 O(阶段数 × max_workers)，不随分配方案数增长
+    返回与 evaluate_allocations 字段相同的结构化数组，按人数升序
+    """
+    beats = np.asarray(beats, dtype=float)
+    counts = np.arange(1, max_workers + 1)
+    candidates = np.unique((counts[:, None] * total_time / beats[None, :]).ravel())
+    # 略微缩小以免浮点误差使恰好整除的人数多算 1
+    needed = np.maximum(np.ceil(candidates[:, None] * beats[None, :] / total_time * (1 - 1e-12)), 1)
+    needed = needed.astype(int)
+    headcount = needed.sum(axis=1)
+    feasible = headcount <= max_workers
+    needed, headcount = needed[feasible], headcount[feasible]
+
+    # headcount 随候选产能单调不减，同一人数取最后(产能最高)的一个
+    last = np.r_[headcount[1:] != headcount[:-1], True]
+    needed, headcount = needed[last], headcount[last]
+
+    result = np.empty(len(headcount), dtype=ALLOCATION_DTYPE)
+    result['n1'], result['n2'], result['n3'] = needed.T
+    stage_capacity = needed * total_time / beats[None, :]
+    result['c1'], result['c2'], result['c3'] = stage_capacity.T
+    result['capacity'] = stage_capacity.min(axis=1)
+    result['efficiency'] = result['capacity'] / headcount
+    return result
+
+def plot_allocations(allocations, optimal, beats=beat_A1, total_time=total_time, output=None,
+                     show=None, max_points=5000):
+    """
+    allocations -- evaluate_allocations 返回的结构化数组
+    optimal -- 推荐分配 (n1, n2, n3)
+    output -- 图片保存路径，None 不保存
+    show -- 是否弹出窗口，None 时仅在交互式后端下显示(见 plotting.finish)
+    max_points -- 散点图与折线图的绘制点数上限，超出时散点改为分箱着色、折线按分段最值抽稀
+    """
+    import matplotlib.pyplot as plt
+    from plotting import decimate, finish, scatter
+
+    workers = list(optimal)
+    opt_capacities = [n * total_time / beat for n, beat in zip(workers, beats)]
+    opt_capacity = min(opt_capacities)
+    opt_efficiency = opt_capacity / sum(workers)
+    efficiencies = allocations['efficiency']
+
+    fig = plt.figure(figsize=(18, 12))
+
+    ax = plt.subplot(2, 2, 1)
+    sc = scatter(ax, allocations['n1'], allocations['n2'], c=efficiencies, max_points=max_points,
+                 cmap='viridis', alpha=0.7)
+    plt.colorbar(sc, label='Efficiency (units/worker/day)')
+    plt.plot(workers[0], workers[1], 'ro', markersize=10, label='Optimal (3:2:2 ratio)')
+    plt.xlabel('Assembly Workers (n1)')
+    plt.ylabel('Testing Workers (n2)')
+    plt.title('Worker Allocation Efficiency Map\n(Color shows efficiency)')
+    plt.legend()
+    plt.grid(True)
+
+    plt.subplot(2, 2, 2)
+    for field, label in [('c1', 'Assembly Capacity'), ('c2', 'Testing Capacity'),
+                         ('c3', 'Packaging Capacity')]:
+        idx = decimate(allocations[field], max_points)
+        plt.plot(idx, allocations[field][idx], label=label, alpha=0.7)
+    plt.axhline(y=opt_capacity, color='r', linestyle='--',
+                label=f'Optimal Capacity: {opt_capacity:.0f}')
+    plt.xlabel('Allocation Scheme Index')
+    plt.ylabel('Daily Capacity (units)')
+    plt.title('Capacity Comparison Across Stages')
+    plt.legend()
+    plt.grid(True)
+
+    plt.subplot(2, 2, 3)
+    stages = ['Assembly', 'Testing', 'Packaging']
+    bars = plt.bar(stages, workers, alpha=0.6, label='Workers')
+    plt.xlabel('Production Stage')
+    plt.ylabel('Number of Workers')
+    plt.title('Optimal Worker Allocation (3:2:2 Ratio)')
+
+    for i, bar in enumerate(bars):
+        height = bar.get_height()
+        plt.text(bar.get_x() + bar.get_width()/2., height,
+                 f'{workers[i]} workers\n{opt_capacities[i]:.0f} units',
+                 ha='center', va='bottom')
+
+    plt.grid(True, axis='y')
+
+    plt.subplot(2, 2, 4)
+    plt.hist(efficiencies, bins=30, edgecolor='black', alpha=0.7)
+    plt.axvline(opt_efficiency, color='r', linestyle='dashed', linewidth=2,
+                label=f'Optimal: {opt_efficiency:.2f}')
+    plt.xlabel('Efficiency (units/worker/day)')
+    plt.ylabel('Number of Allocation Schemes')
+    plt.title('Efficiency Distribution of All Possible Allocations')
+    plt.legend()
+    plt.grid(True)
+
+    plt.tight_layout()
+    finish(fig, output, show)
+
+
+if __name__ == '__main__':
+    k = max_workers // (3 + 2 + 2)  # 3:2:2比例，7k ≤ 48
+    n1_opt = 3 * k                  # 组装工人数
+    n2_opt = 2 * k                  # 测试工人数
+    n3_opt = 2 * k                  # 包装工人数
+
+    # 产能
+    capacity1 = n1_opt * total_time / beat_A1[0]
+    capacity2 = n2_opt * total_time / beat_A1[1]
+    capacity3 = n3_opt * total_time / beat_A1[2]
+    total_capacity = min(capacity1, capacity2, capacity3)
+    efficiency = total_capacity / (n1_opt + n2_opt + n3_opt)
+
+    print("最优工人分配(3:2:2比例方法):")
+    print(f"  组装工人: {n1_opt}")
+    print(f"  测试工人: {n2_opt}")
+    print(f"  包装工人: {n3_opt}")
+    print(f"  总工人数: {n1_opt + n2_opt + n3_opt}")
+    print(f"  日产能: {total_capacity:.0f} 件")
+    print(f"  效率: {efficiency:.2f} 件/工人/天")
+
+    allocations = evaluate_allocations()
+    plot_allocations(allocations, (n1_opt, n2_opt, n3_opt))
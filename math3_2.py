@@ -1,182 +1,421 @@
-import itertools
-from typing import Tuple, Dict
-import matplotlib.pyplot as plt
+import csv
+import logging
+import math
+from typing import Tuple, Dict, List, NamedTuple, Optional
 import numpy as np
+from instrumentation import phase, timed
+
+logger = logging.getLogger(__name__)
+
+# 题目数据: 产品产量与各阶段节拍时间(分钟/件)
+PRODUCTS = ['A1', 'A2']
+STAGES = ['assembly', 'test', 'packaging']
+ORDER_COUNTS = [100, 500]
+BEAT_TIMES = [[96, 64, 64],
+              [32, 21, 24]]
+STAGE_NAMES = {'assembly': '组装', 'test': '测试', 'packaging': '包装'}
+
+class Workload(NamedTuple):
+    matrix: np.ndarray      # 工作量矩阵(人·分钟)，形状 (产品数, 阶段数)
+    products: List[str]
+    stages: List[str]
+
+def load_workload(source=None, counts=None, products: Optional[List[str]] = None,
+                  stages: Optional[List[str]] = None) -> Workload:
+    """
+    构造工作量矩阵 workload[p, j] = 产量[p] * 节拍时间[p, j]
+    source -- None(题目的节拍时间)、数组 或 CSV 文件路径
+    counts -- 各产品产量；给出时数组 source 视为节拍时间矩阵，否则视为工作量矩阵；
+              source 为 None 时默认题目产量，给出则只替换产量，如 load_workload(counts=[120, 500])
+    products -- 产品名称，默认 P1, P2, ...
+    stages -- 阶段名称，默认 stage1, stage2, ...
+    CSV 文件表头为 product,count,<阶段1>,<阶段2>,...，每行一个产品的产量和各阶段节拍时间
+    """
+    if source is None:
+        source = BEAT_TIMES
+        counts = ORDER_COUNTS if counts is None else counts
+        products = PRODUCTS if products is None else products
+        stages = STAGES if stages is None else stages
+    elif isinstance(source, str) or hasattr(source, '__fspath__'):
+        with open(source, newline='', encoding='utf-8') as f:
+            rows = list(csv.reader(f))
+        header, rows = [h.strip() for h in rows[0]], [r for r in rows[1:] if r]
+        products = [r[0].strip() for r in rows] if products is None else products
+        stages = header[2:] if stages is None else stages
+        counts = [float(r[1]) for r in rows] if counts is None else counts
+        source = [[float(v) for v in r[2:]] for r in rows]
+
+    matrix = np.atleast_2d(np.asarray(source, dtype=float))
+    if counts is not None:
+        matrix = np.asarray(counts, dtype=float)[:, None] * matrix
+    n_products, n_stages = matrix.shape
+    products = [f'P{i + 1}' for i in range(n_products)] if products is None else list(products)
+    stages = [f'stage{j + 1}' for j in range(n_stages)] if stages is None else list(stages)
+    if len(products) != n_products or len(stages) != n_stages:
+        raise ValueError("产品/阶段名称数量与工作量矩阵形状不一致")
+    if np.any(matrix < 0):
+        raise ValueError("工作量不能为负")
+    return Workload(matrix, products, stages)
+
+def _as_workload(workload) -> Workload:
+    return workload if isinstance(workload, Workload) else load_workload(workload)
+
+def _min_workers(workloads: np.ndarray, t: float, min_workers: np.ndarray) -> np.ndarray:
+    """
+    每个工作单元在时间 t 内完成工作量所需的最少人数
+    workloads -- 各工作单元的工作量(人·分钟)
+    t -- 目标完成时间(分钟)
+    min_workers -- 各工作单元的人数下限
+    """
+    x = np.maximum(np.ceil(workloads / t), 1)
+    # 修正浮点误差，保证 workload / x <= t 且 x 最小
+    x = np.where((x > 1) & (workloads / np.maximum(x - 1, 1) <= t), x - 1, x)
+    x = np.where(workloads / x > t, x + 1, x)
+    return np.maximum(x, min_workers).astype(int)
+
+def _minimax_allocation(workloads, max_workers: int, min_workers=1) -> Tuple[float, np.ndarray]:
+    """
+    最小化 max(workload_i / x_i)，约束 sum(x_i) = max_workers, x_i >= min_workers
+    对总时间 t 二分，可行性判定为 sum(ceil(workload_i / t)) <= max_workers
+    返回 (最短总时间, 各工作单元人数)，多个最优解时取字典序最小的分配(与逐层枚举的结果一致)
+    """
+    w = np.asarray(workloads, dtype=float)
+    lb = np.broadcast_to(np.asarray(min_workers, dtype=int), w.shape)
+    if lb.sum() > max_workers:
+        return float('inf'), None
+
+    # 下界: 连续松弛的最优值 sum(w) / max_workers 的略小值必不可行
+    # 上界: 每个工作单元只分配下限人数；sum(w) / (max_workers - sum(lb)) 时 sum(max(lb, ceil(w/t))) <= max_workers 必然成立，
+    # 且不超过只分配下限人数时的总时间
+    # 可行时把上界收缩到该分配实际达到的总时间(候选值 workload_i / x)，
+    # 若略小于它的时间已不可行即为最优，通常几步即可终止
+    hi = float(np.max(w / lb))
+    if max_workers > lb.sum() and hi > 0:
+        hi = min(hi, float(np.max(w / _min_workers(w, w.sum() / (max_workers - lb.sum()), lb))))
+    lo = float(w.sum()) / max_workers * (1 - 1e-9)
+    with phase('minimax.bisection', space=_search_space(max_workers, lb)) as probe:
+        while hi > 0:
+            probe['candidates'] += 1
+            if _min_workers(w, np.nextafter(hi, 0), lb).sum() > max_workers:
+                break
+            mid = (lo + hi) / 2
+            if mid <= lo or mid >= hi:
+                break
+            probe['candidates'] += 1
+            x = _min_workers(w, mid, lb)
+            if x.sum() <= max_workers:
+                hi = float(np.max(w / x))
+                probe['improvements'] += 1
+            else:
+                lo = mid
+    min_time = max(hi, 0.0)
+
+    # 字典序最小: 前面的工作单元取最少人数，剩余工人全部分给最后一个单元
+    x = _min_workers(w, min_time, lb) if min_time > 0 else lb.copy()
+    x[-1] += max_workers - x.sum()
+    return float(np.max(w / x)), x
+
+def _search_space(max_workers: int, min_workers: np.ndarray) -> int:
+    # 逐一枚举时的分配方案数: 在各单元下限之上分配剩余工人的组合数
+    return math.comb(max_workers - int(min_workers.sum()) + len(min_workers) - 1, len(min_workers) - 1)
+
+def _min_workers_below(workloads: np.ndarray, t: float, min_workers: np.ndarray) -> np.ndarray:
+    # 完成时间严格小于 t 所需的最少人数
+    x = np.floor(workloads / t) + 1
+    x = np.where((x > 1) & (workloads / np.maximum(x - 1, 1) < t), x - 1, x)
+    x = np.where(workloads / x >= t, x + 1, x)
+    return np.maximum(x, min_workers).astype(int)
+
+def _repair_allocation(workloads, max_workers: int, counts, min_workers=1) -> Tuple[float, np.ndarray]:
+    """
+    以已有分配为起点求 _minimax_allocation 的最优解，只在瓶颈与富余单元之间调动工人
+    1. 总人数变化: 新增工人逐个分给当前瓶颈，减少的工人从减员后耗时最短的单元抽调
+    2. 调整: 记总时间 T，need 为各单元耗时严格小于 T 所需的最少人数；
+       若 sum(need) > max_workers，则任何分配都达不到小于 T 的总时间，当前分配最优(最优性证明)；
+       否则瓶颈单元缺 1 人、富余单元(人数 > need)有多余，从富余单元向瓶颈单元调动
+    调动次数与工作量/人数的变化幅度成正比，与总人数无关
+    返回 (最短总时间, 各工作单元人数)
+    """
+    w = np.asarray(workloads, dtype=float)
+    lb = np.broadcast_to(np.asarray(min_workers, dtype=int), w.shape)
+    if lb.sum() > max_workers:
+        return float('inf'), None
+    x = np.maximum(np.asarray(counts, dtype=int), lb).copy()
+
+    with phase('repair.resize') as probe:
+        while x.sum() < max_workers:
+            x[np.argmax(w / x)] += 1
+            probe['candidates'] += 1
+        while x.sum() > max_workers:
+            removable = x > lb
+            after = np.where(removable, w / np.maximum(x - 1, 1), np.inf)
+            x[np.argmin(after)] -= 1
+            probe['candidates'] += 1
+
+    with phase('repair.exchange', space=_search_space(max_workers, lb)) as probe:
+        while True:
+            t = float(np.max(w / x))
+            if t <= 0:
+                break
+            probe['candidates'] += 1
+            need = _min_workers_below(w, t, lb)
+            if need.sum() > max_workers:
+                break
+            deficit = np.flatnonzero(need > x)
+            surplus = np.flatnonzero(x > need)
+            for i, j in zip(deficit, np.repeat(surplus, (x - need)[surplus])):
+                x[i] += 1
+                x[j] -= 1
+            probe['improvements'] += 1
+    return t, x
 
 # 单元级CELL详细计算过程
-def cell_unit_optimization(max_workers: int = 48) -> Tuple[float, Dict]:
-    workload = {
-        'A1': {'assembly': 100*96, 'test': 100*64, 'packaging': 100*64},
-        'A2': {'assembly': 500*32, 'test': 500*21, 'packaging': 500*24}
-    }
-    min_total_time = float('inf')
-    best_config = {}
-    
-    print("\n=== 单元级CELL计算过程 ===")
-    for a1 in range(1, max_workers-4):
-        for a2 in range(1, max_workers-a1-3):
-            # 组装阶段计算
-            t_a1_assembly = workload['A1']['assembly'] / a1
-            t_a2_assembly = workload['A2']['assembly'] / a2
-            t_assembly = max(t_a1_assembly, t_a2_assembly)
-            
-            for b1 in range(1, max_workers-a1-a2-2):
-                for b2 in range(1, max_workers-a1-a2-b1-1):
-                    # 测试阶段计算
-                    t_a1_test = workload['A1']['test'] / b1
-                    t_a2_test = workload['A2']['test'] / b2
-                    t_test = max(t_a1_test, t_a2_test)
-                    
-                    for c1 in range(1, max_workers-a1-a2-b1-b2):
-                        c2 = max_workers - a1 - a2 - b1 - b2 - c1
-                        if c2 < 1: continue
-                        
-                        # 包装阶段计算
-                        t_a1_pack = workload['A1']['packaging'] / c1
-                        t_a2_pack = workload['A2']['packaging'] / c2
-                        t_packaging = max(t_a1_pack, t_a2_pack)
-                        
-                        total_time = max(t_assembly, t_test, t_packaging)
-                        
-                        if total_time < min_total_time:
-                            min_total_time = total_time
-                            best_config = {
-                                'assembly': {'A1':a1, 'A2':a2, 
-                                             'time_A1':t_a1_assembly, 'time_A2':t_a2_assembly},
-                                'test': {'A1':b1, 'A2':b2, 
-                                         'time_A1':t_a1_test, 'time_A2':t_a2_test},
-                                'packaging': {'A1':c1, 'A2':c2, 
-                                              'time_A1':t_a1_pack, 'time_A2':t_a2_pack},
-                                'total_time': total_time
-                            }
-                            print(f"发现更优解: 总时间={total_time:.2f}分钟")
-                            print(f"  组装: A1={a1}人({t_a1_assembly:.2f}min), A2={a2}人({t_a2_assembly:.2f}min)")
-                            print(f"  测试: A1={b1}人({t_a1_test:.2f}min), A2={b2}人({t_a2_test:.2f}min)")
-                            print(f"  包装: A1={c1}人({t_a1_pack:.2f}min), A2={c2}人({t_a2_pack:.2f}min)")
-                            print(f"  总工人数={a1+a2+b1+b2+c1+c2}")
-    
+@timed('cell_unit_optimization')
+def cell_unit_optimization(max_workers: int = 48, workload=None) -> Tuple[float, Dict]:
+    """
+    每个(阶段, 产品)组合独立分配工人，总时间由最慢的组合决定
+    max_workers -- 总工人数
+    workload -- 工作量表，见 load_workload
+    """
+    wl = _as_workload(workload)
+
+    logger.info("\n=== 单元级CELL计算过程 ===")
+    # 按阶段优先展开，顺序与 a1,a2,b1,b2,c1,c2 一致
+    min_total_time, workers = _minimax_allocation(wl.matrix.T.ravel(), max_workers)
+    if workers is None:
+        return min_total_time, {}
+    best_config = _unit_config(wl, workers, min_total_time)
+
+    logger.info(f"最优解: 总时间={min_total_time:.2f}分钟")
+    for stage in wl.stages:
+        info = ", ".join(f"{p}={best_config[stage][p]}人({best_config[stage][f'time_{p}']:.2f}min)"
+                         for p in wl.products)
+        logger.info(f"  {STAGE_NAMES.get(stage, stage)}: {info}")
+    logger.info(f"  总工人数={int(workers.sum())}")
+
     return min_total_time, best_config
 
+def _unit_config(wl: Workload, workers: np.ndarray, min_total_time: float) -> Dict:
+    workers = workers.reshape(len(wl.stages), len(wl.products))
+    config = {}
+    for j, stage in enumerate(wl.stages):
+        config[stage] = {}
+        for i, product in enumerate(wl.products):
+            config[stage][product] = int(workers[j, i])
+            config[stage][f'time_{product}'] = float(wl.matrix[i, j]) / int(workers[j, i])
+    config['total_time'] = min_total_time
+    return config
+
+def _series_config(total_workload: np.ndarray, stages: List[str], workers: np.ndarray,
+                   min_total_time: float) -> Dict:
+    config = {stage: int(n) for stage, n in zip(stages, workers)}
+    config['times'] = tuple(float(w) / int(n) for w, n in zip(total_workload, workers))
+    config['total_time'] = min_total_time
+    return config
+
 # 直线型CELL详细计算过程
-def cell_series_optimization(max_workers: int = 48) -> Tuple[float, Dict]:
-    total_workload = {
-        'assembly': 100*96+500*32,
-        'test': 100*64+500*21,
-        'packaging': 100*64+500*24
-    }
-    min_total_time = float('inf')
-    best_config = {}
-    
-    print("\n=== 直线型CELL计算过程 ===")
-    for a in range(1, max_workers-1):
-        for b in range(1, max_workers-a):
-            c = max_workers - a - b
-            if c < 1: continue
-            
-            t_assembly = total_workload['assembly'] / a
-            t_test = total_workload['test'] / b
-            t_packaging = total_workload['packaging'] / c
-            total_time = max(t_assembly, t_test, t_packaging)
-            
-            if total_time < min_total_time:
-                min_total_time = total_time
-                best_config = {
-                    'assembly': a, 'test': b, 'packaging': c,
-                    'times': (t_assembly, t_test, t_packaging),
-                    'total_time': total_time
-                }
-                print(f"发现更优解: 总时间={total_time:.2f}分钟")
-                print(f"  组装={a}人({t_assembly:.2f}min), 测试={b}人({t_test:.2f}min), 包装={c}人({t_packaging:.2f}min)")
-                print(f"  总工人数={a+b+c}")
-    
+@timed('cell_series_optimization')
+def cell_series_optimization(max_workers: int = 48, workload=None) -> Tuple[float, Dict]:
+    """
+    各阶段混合生产所有产品，阶段内工人串联
+    max_workers -- 总工人数
+    workload -- 工作量表，见 load_workload
+    """
+    wl = _as_workload(workload)
+    total_workload = wl.matrix.sum(axis=0)
+
+    logger.info("\n=== 直线型CELL计算过程 ===")
+    min_total_time, workers = _minimax_allocation(total_workload, max_workers)
+    if workers is None:
+        return min_total_time, {}
+
+    best_config = _series_config(total_workload, wl.stages, workers, min_total_time)
+
+    logger.info(f"最优解: 总时间={min_total_time:.2f}分钟")
+    logger.info("  " + ", ".join(f"{STAGE_NAMES.get(stage, stage)}={n}人({t:.2f}min)"
+                                 for stage, n, t in zip(wl.stages, workers, best_config['times'])))
+    logger.info(f"  总工人数={int(workers.sum())}")
+
     return min_total_time, best_config
 
+def _divisor_splits(max_workers: int, min_processes: int, max_processes: Optional[int] = None,
+                    max_lines: Optional[int] = None) -> np.ndarray:
+    """
+    人数拆分表: splits[a] 为满足 a = n*s、min_processes <= s <= max_processes、n <= max_lines
+    的最少线数 n，无法拆分时为 0
+    按线数从大到小筛出各自的倍数，线数少的后写入覆盖，总计算量 O(W log W)
+    """
+    splits = np.zeros(max_workers + 1, dtype=int)
+    s_min = max(min_processes, 1)
+    s_max = max_workers if max_processes is None else min(max_processes, max_workers)
+    n_max = max_workers // s_min if max_lines is None else min(max_lines, max_workers // s_min)
+    for n in range(n_max, 0, -1):
+        splits[n * np.arange(s_min, min(s_max, max_workers // n) + 1)] = n
+    return splits
+
+def _parallel_allocation(total_workload: np.ndarray, stages: List[str], max_workers: int,
+                         min_processes: int) -> Tuple[float, Dict]:
+    # n=1 时 s=a，故 a >= min_processes 总能拆分，人数下限即 min_processes
+    min_total_time, workers = _minimax_allocation(total_workload, max_workers,
+                                                  max(min_processes, 1))
+    if workers is None:
+        return min_total_time, {}
+    return min_total_time, _parallel_config(total_workload, stages, workers, min_total_time)
+
+def _parallel_config(total_workload: np.ndarray, stages: List[str], workers: np.ndarray,
+                     min_total_time: float, splits: Optional[np.ndarray] = None) -> Dict:
+    """
+    splits -- 受约束时的人数拆分表(见 _divisor_splits)；None 时线数最少的拆分总是 1 条线 × a 个工序
+    """
+    config = {}
+    for stage, a in zip(stages, workers):
+        n = 1 if splits is None else int(splits[a])
+        config[stage] = (n, int(a) // n)
+    config['times'] = tuple(float(w) / int(a) for w, a in zip(total_workload, workers))
+    config['total_time'] = min_total_time
+    return config
+
 # 混联型CELL详细计算过程
-def cell_parallel_optimization(max_workers: int = 48, min_processes: int = 2) -> Tuple[float, Dict]:
-    total_workload = {
-        'assembly': 100*96+500*32,
-        'test': 100*64+500*21,
-        'packaging': 100*64+500*24
-    }
-    min_total_time = float('inf')
-    best_config = {}
-    
-    print("\n=== 混联型CELL计算过程 ===")
-    for a in range(1, max_workers-1):
-        a_combinations = [(n, a//n) for n in range(1, a+1) if a%n==0 and (a//n)>=min_processes]
-        if not a_combinations: continue
-        
-        for n_a, s_a in a_combinations:
-            for b in range(1, max_workers-a):
-                b_combinations = [(n, b//n) for n in range(1, b+1) if b%n==0 and (b//n)>=min_processes]
-                if not b_combinations: continue
-                
-                for n_b, s_b in b_combinations:
-                    c = max_workers - a - b
-                    if c < min_processes: continue  
-                    
-                    c_combinations = [(n, c//n) for n in range(1, c+1) if c%n==0 and (c//n)>=min_processes]
-                    if not c_combinations: continue
-                    
-                    for n_c, s_c in c_combinations:
-                        t_assembly = total_workload['assembly'] / (n_a * s_a)
-                        t_test = total_workload['test'] / (n_b * s_b)
-                        t_packaging = total_workload['packaging'] / (n_c * s_c)
-                        total_time = max(t_assembly, t_test, t_packaging)
-                        
-                        if total_time < min_total_time:
-                            min_total_time = total_time
-                            best_config = {
-                                'assembly': (n_a, s_a), 'test': (n_b, s_b), 'packaging': (n_c, s_c),
-                                'times': (t_assembly, t_test, t_packaging),
-                                'total_time': total_time
-                            }
-                            print(f"发现更优解: 总时间={total_time:.2f}分钟")
-                            print(f"  组装: {n_a}条线×{s_a}工序({a}人) → {t_assembly:.2f}min")
-                            print(f"  测试: {n_b}条线×{s_b}工序({b}人) → {t_test:.2f}min")
-                            print(f"  包装: {n_c}条线×{s_c}工序({c}人) → {t_packaging:.2f}min")
-                            print(f"  总工人数={a+b+c}")
-    
+@timed('cell_parallel_optimization')
+def cell_parallel_optimization(max_workers: int = 48, min_processes: int = 2,
+                               workload=None) -> Tuple[float, Dict]:
+    """
+    各阶段由 n 条并行生产线组成，每条线 s 个工序(s >= min_processes)
+    阶段耗时只与阶段人数 n*s 有关，因此先按人数下限 min_processes 求最优人数，
+    再为每个阶段取线数最少的拆分方式(a >= min_processes 时即 1 条线 × a 个工序)
+    max_workers -- 总工人数
+    min_processes -- 每条生产线的最少工序数
+    workload -- 工作量表，见 load_workload
+    """
+    wl = _as_workload(workload)
+
+    logger.info("\n=== 混联型CELL计算过程 ===")
+    min_total_time, best_config = _parallel_allocation(
+        wl.matrix.sum(axis=0), wl.stages, max_workers, min_processes)
+    if not best_config:
+        return min_total_time, best_config
+
+    logger.info(f"最优解: 总时间={min_total_time:.2f}分钟")
+    for stage, t in zip(wl.stages, best_config['times']):
+        n, p = best_config[stage]
+        logger.info(f"  {STAGE_NAMES.get(stage, stage)}: {n}条线×{p}工序({n * p}人) → {t:.2f}min")
+    logger.info(f"  总工人数={sum(n * p for n, p in (best_config[stage] for stage in wl.stages))}")
+
     return min_total_time, best_config
 
+@timed('cell_parallel_sweep')
+def cell_parallel_sweep(worker_range, min_processes: int = 2, workload=None) -> List[Tuple[int, float, Dict]]:
+    """
+    对一组总工人数批量求解混联型CELL，工作量表只解析一次
+    worker_range -- 总工人数序列，如 range(10, 1001)
+    返回 [(总工人数, 最短总时间, 最优配置), ...]
+    """
+    wl = _as_workload(workload)
+    total_workload = wl.matrix.sum(axis=0)
+    worker_range = [int(w) for w in worker_range]
+    return [(w, *_parallel_allocation(total_workload, wl.stages, w, min_processes))
+            for w in worker_range]
+
+@timed('reoptimize')
+def reoptimize(previous_config: Dict, max_workers: int = 48, workload=None,
+               min_processes: int = 2) -> Tuple[float, Dict]:
+    """
+    产量或人数小幅变化后，以上一次的最优配置为状态增量修复，而不是重新求解
+    previous_config -- 任一优化函数返回的配置(单元级/直线型/混联型由其格式自动识别)
+    max_workers -- 新的总工人数
+    workload -- 新的工作量表，见 load_workload；产品与阶段须与原配置一致。
+                不带名称的数组(工作量矩阵)沿用原配置的阶段与产品名称，只检查形状
+    min_processes -- 混联型CELL每条生产线的最少工序数
+    返回与对应优化函数相同格式的 (最短总时间, 最优配置)
+    """
+    stages = _stage_keys(previous_config)
+    first = previous_config[stages[0]]
+    wl = _workload_like(workload, stages, first)
+    if stages != wl.stages:
+        raise ValueError("工作量表的阶段与原配置不一致")
+
+    if isinstance(first, dict):
+        if [k for k in first if not k.startswith('time_')] != wl.products:
+            raise ValueError("工作量表的产品与原配置不一致")
+        counts = [previous_config[stage][p] for stage in stages for p in wl.products]
+        min_total_time, workers = _repair_allocation(wl.matrix.T.ravel(), max_workers, counts)
+        if workers is None:
+            return min_total_time, {}
+        return min_total_time, _unit_config(wl, workers, min_total_time)
+
+    total_workload = wl.matrix.sum(axis=0)
+    if isinstance(first, tuple):
+        counts = [n * p for n, p in (previous_config[stage] for stage in stages)]
+        min_total_time, workers = _repair_allocation(total_workload, max_workers, counts,
+                                                     max(min_processes, 1))
+        if workers is None:
+            return min_total_time, {}
+        return min_total_time, _parallel_config(total_workload, stages, workers, min_total_time)
+
+    counts = [previous_config[stage] for stage in stages]
+    min_total_time, workers = _repair_allocation(total_workload, max_workers, counts)
+    if workers is None:
+        return min_total_time, {}
+    return min_total_time, _series_config(total_workload, stages, workers, min_total_time)
+
+def _workload_like(workload, stages: List[str], first) -> Workload:
+    # 数组工作量按原配置命名；Workload、None(题目数据)与 CSV 路径自带名称
+    if workload is None or isinstance(workload, (Workload, str)) or hasattr(workload, '__fspath__'):
+        return _as_workload(workload)
+    matrix = np.atleast_2d(np.asarray(workload, dtype=float))
+    products = [k for k in first if not k.startswith('time_')] if isinstance(first, dict) else None
+    if matrix.shape[1] != len(stages) or (products is not None and matrix.shape[0] != len(products)):
+        raise ValueError("工作量矩阵的形状与原配置不一致")
+    return load_workload(matrix, products=products, stages=stages)
+
+def _stage_keys(data: Dict) -> List[str]:
+    return [k for k in data if k not in ('times', 'total_time')]
+
 def print_detailed_result(structure: str, data: Dict):
     print(f"\n=== {structure} 详细结果 ===")
     
-    stage_names = {"assembly": "组装", "test": "测试", "packaging": "包装"}
-    stage_keys = {v: k for k, v in stage_names.items()}  
+    stage_keys = _stage_keys(data)
+    stage_names = [STAGE_NAMES.get(k, k) for k in stage_keys]
     
     if structure != '单元级CELL':
-        bottleneck = ['组装', '测试', '包装'][data['times'].index(max(data['times']))]
+        bottleneck = stage_names[data['times'].index(max(data['times']))]
         print(f"总时间: {data['total_time']:.2f}分钟（瓶颈阶段: {bottleneck}）")
     else:
         print(f"总时间: {data['total_time']:.2f}分钟")
     
     if structure == '单元级CELL':
-        print("阶段           A1人数/时间         A2人数/时间            阶段总时间")
-        print("──────────────────────────────────────────────────────────────────────")
-        for stage_key, stage_name in stage_names.items():
+        products = [k for k in data[stage_keys[0]] if not k.startswith('time_')]
+        print("阶段  " + "".join(f"{' ' * 9}{p}人数/时间" for p in products) + f"{' ' * 12}阶段总时间")
+        print("─" * (30 + 20 * len(products)))
+        for stage_key, stage_name in zip(stage_keys, stage_names):
             s = data[stage_key]
-            a1_info = f"{s['A1']}人/{s['time_A1']:.2f}分钟"
-            a2_info = f"{s['A2']}人/{s['time_A2']:.2f}分钟"
-            total_time = f"{max(s['time_A1'], s['time_A2']):.2f}分钟"
-            print(f"{stage_name:<8} {a1_info:>16} {a2_info:>16} {total_time:>16}")
+            infos = " ".join(f"{str(s[p]) + '人/' + format(s['time_' + p], '.2f') + '分钟':>16}"
+                             for p in products)
+            total_time = f"{max(s['time_' + p] for p in products):.2f}分钟"
+            print(f"{stage_name:<8} {infos} {total_time:>16}")
     else:
         print("阶段       工人数    工序配置        阶段耗时")
         print("─────────────────────────────────────────────────")
-        for stage in ['组装', '测试', '包装']:
+        for i, (stage_key, stage) in enumerate(zip(stage_keys, stage_names)):
             if structure == '直线型CELL':
-                workers = data[stage_keys[stage]]
+                workers = data[stage_key]
                 process = "整体拆分"
-                time = data['times'][['组装', '测试', '包装'].index(stage)]
             else:
-                n, s = data[stage_keys[stage]]
+                n, s = data[stage_key]
                 workers = n * s
                 process = f"{n}条×{s}序"
-                time = data['times'][['组装', '测试', '包装'].index(stage)]
+            time = data['times'][i]
             
             print(f"{stage:<8} {workers:>3}人    {process:<12} {time:>8.2f}分钟")
 
-def visualize_results(unit_data, series_data, parallel_data):
+def visualize_results(unit_data, series_data, parallel_data, output=None, show=None):
+    """
+    output -- 图片保存路径，None 不保存
+    show -- 是否弹出窗口，None 时仅在交互式后端下显示(见 plotting.finish)
+    """
+    import matplotlib.pyplot as plt
+    from plotting import finish
+
     fig, axs = plt.subplots(2, 2, figsize=(12, 10))
     fig.suptitle("Visual Comparison of Production Line Optimization Results", fontsize=16)
 
@@ -187,12 +426,10 @@ def visualize_results(unit_data, series_data, parallel_data):
     axs[0, 0].set_ylabel("Time (minutes)")
     axs[0, 0].grid(axis='y', linestyle='--', alpha=0.7)
 
-    stages = ['Assembly', 'Test', 'Packaging']
-    unit_times = [
-        max(unit_data['assembly']['time_A1'], unit_data['assembly']['time_A2']),
-        max(unit_data['test']['time_A1'], unit_data['test']['time_A2']),
-        max(unit_data['packaging']['time_A1'], unit_data['packaging']['time_A2'])
-    ]
+    stage_keys = _stage_keys(series_data)
+    stages = [k.capitalize() for k in stage_keys]
+    unit_times = [max(v for k, v in unit_data[stage].items() if k.startswith('time_'))
+                  for stage in stage_keys]
     series_times = series_data['times']
     parallel_times = parallel_data['times']
 
@@ -208,14 +445,11 @@ def visualize_results(unit_data, series_data, parallel_data):
 
     def get_worker_distribution(data, structure):
         if structure == 'Unit CELL':
-            return [
-                data['assembly']['A1'] + data['assembly']['A2'],
-                data['test']['A1'] + data['test']['A2'],
-                data['packaging']['A1'] + data['packaging']['A2']
-            ]
+            return [sum(v for k, v in data[stage].items() if not k.startswith('time_'))
+                    for stage in stage_keys]
         else:
-            return [data['assembly'], data['test'], data['packaging']] if structure == 'Series CELL' \
-                else [data['assembly'][0]*data['assembly'][1], data['test'][0]*data['test'][1], data['packaging'][0]*data['packaging'][1]]
+            return [data[stage] for stage in stage_keys] if structure == 'Series CELL' \
+                else [data[stage][0]*data[stage][1] for stage in stage_keys]
 
     unit_workers = get_worker_distribution(unit_data, 'Unit CELL')
     series_workers = get_worker_distribution(series_data, 'Series CELL')
@@ -229,9 +463,14 @@ def visualize_results(unit_data, series_data, parallel_data):
 
     plt.tight_layout()
     plt.subplots_adjust(top=0.92)
-    plt.show()
+    finish(fig, output, show)
     
 if __name__ == "__main__":
+    import sys
+
+    logging.basicConfig(level=logging.INFO, format='%(message)s', stream=sys.stdout)
+    max_workers = 48
+    workload = load_workload()
     unit_time, unit_data = cell_unit_optimization()
     series_time, series_data = cell_series_optimization()
     parallel_time, parallel_data = cell_parallel_optimization()
@@ -248,5 +487,5 @@ if __name__ == "__main__":
     print(f"\n===== 最终推荐方案 =====")
     print(f"最优结构: {best_structure}")
     print(f"总生产时间: {best_time:.2f}分钟")
-    print(f"总工人数利用: 48人")
-    print(f"效率指标(设备利用率): {(60900/(best_time*48))*100:.2f}%")
\ No newline at end of file
+    print(f"总工人数利用: {max_workers}人")
+    print(f"效率指标(设备利用率): {(workload.matrix.sum()/(best_time*max_workers))*100:.2f}%")
\ No newline at end of file
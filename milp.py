@@ -0,0 +1,165 @@
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from math3_2 import _as_workload, _divisor_splits, _parallel_config, _series_config, _unit_config
+
+def _require_pulp():
+    try:
+        import pulp
+    except ImportError as exc:
+        raise ImportError("MILP 后端需要 pulp，请先执行 pip install pulp") from exc
+    return pulp
+
+def _solve_min_makespan(options: List[List[Tuple[int, float]]], groups: List[Tuple[List[int], int]],
+                        max_workers: int, time_limit: Optional[float], msg: bool) -> Optional[List[int]]:
+    """
+    options -- 每个工作单元的候选 [(人数, 耗时), ...]
+    groups -- 附加的分组人数上限 [(单元下标列表, 上限), ...]
+    模型: min T  s.t. 每个单元恰选一个候选, T >= 所选候选的耗时, 总人数 <= max_workers
+    返回各单元所选候选的下标，无可行解时返回 None
+    """
+    pulp = _require_pulp()
+    prob = pulp.LpProblem('cell_makespan', pulp.LpMinimize)
+    T = pulp.LpVariable('T', lowBound=0)
+    z = [[pulp.LpVariable(f'z_{i}_{c}', cat='Binary') for c in range(len(opts))]
+         for i, opts in enumerate(options)]
+    prob += T
+    for i, opts in enumerate(options):
+        prob += pulp.lpSum(z[i]) == 1
+        prob += T >= pulp.lpSum(t * v for (_, t), v in zip(opts, z[i]))
+
+    def workers(cells):
+        return pulp.lpSum(n * v for i in cells for (n, _), v in zip(options[i], z[i]))
+
+    prob += workers(range(len(options))) <= max_workers
+    for cells, cap in groups:
+        prob += workers(cells) <= cap
+
+    prob.solve(pulp.PULP_CBC_CMD(msg=msg, timeLimit=time_limit))
+    if pulp.LpStatus[prob.status] != 'Optimal':
+        return None
+    return [max(range(len(opts)), key=lambda c: z[i][c].value() or 0)
+            for i, opts in enumerate(options)]
+
+def _canonical_counts(options, chosen, groups, max_workers, largest_feasible) -> Tuple[float, List[int]]:
+    """
+    由 MILP 的最优总时间还原与 math3_2 相同的字典序最小分配:
+    各单元取耗时不超过最优总时间的最少人数，剩余工人从最后一个单元起在上限内补足
+    largest_feasible(i, limit) -- 单元 i 不超过 limit 的最大可行人数
+    """
+    min_time = max(options[i][c][1] for i, c in enumerate(chosen))
+    idx = [min(c for c, (_, t) in enumerate(opts) if t <= min_time) for opts in options]
+    counts = [options[i][c][0] for i, c in enumerate(idx)]
+    cell_groups = [[g for g, (cells, _) in enumerate(groups) if i in cells]
+                   for i in range(len(options))]
+    room = [cap - sum(counts[i] for i in cells) for cells, cap in groups]
+
+    left = max_workers - sum(counts)
+    for i in reversed(range(len(options))):
+        limit = min([counts[i] + left] + [counts[i] + room[g] for g in cell_groups[i]])
+        added = max(largest_feasible(i, limit), counts[i]) - counts[i]
+        counts[i] += added
+        left -= added
+        for g in cell_groups[i]:
+            room[g] -= added
+    return min_time, counts
+
+def _count_options(w: float, lb: int, ub: int, t_lo: float) -> List[Tuple[int, float]]:
+    # 人数超过 ceil(w / t_lo) 时耗时已低于总时间下界，不会出现在最优解的必要部分
+    ub = min(ub, max(lb, int(np.ceil(w / t_lo))))
+    return [(c, w / c) for c in range(lb, ub + 1)]
+
+def _stage_caps(stages: Sequence[str], stage_caps: Optional[Dict[str, int]], max_workers: int) -> List[int]:
+    stage_caps = stage_caps or {}
+    unknown = set(stage_caps) - set(stages)
+    if unknown:
+        raise ValueError(f"未知的阶段: {sorted(unknown)}")
+    return [int(stage_caps.get(stage, max_workers)) for stage in stages]
+
+def cell_unit_milp(max_workers: int = 48, workload=None, stage_caps: Optional[Dict[str, int]] = None,
+                   time_limit: Optional[float] = None, msg: bool = False) -> Tuple[float, Dict]:
+    """
+    单元级CELL的 MILP 模型，用 pulp 自带的 CBC 求解
+    stage_caps -- 各阶段(所有产品合计)的人数上限，如 {'assembly': 20}
+    time_limit -- 求解时间上限(秒)
+    返回与 math3_2.cell_unit_optimization 相同格式的 (最短总时间, 最优配置)
+    """
+    wl = _as_workload(workload)
+    n_products = len(wl.products)
+    w = wl.matrix.T.ravel()
+    caps = _stage_caps(wl.stages, stage_caps, max_workers)
+    ub = max_workers - (len(w) - 1)
+    t_lo = w.sum() / max_workers
+    options = [_count_options(float(w[i]), 1, min(ub, caps[i // n_products]), t_lo)
+               for i in range(len(w))]
+    groups = [(list(range(j * n_products, (j + 1) * n_products)), cap)
+              for j, cap in enumerate(caps) if cap < max_workers]
+
+    chosen = _solve_min_makespan(options, groups, max_workers, time_limit, msg)
+    if chosen is None:
+        return float('inf'), {}
+    min_time, counts = _canonical_counts(options, chosen, groups, max_workers,
+                                         lambda i, limit: min(limit, caps[i // n_products]))
+    return min_time, _unit_config(wl, np.array(counts), min_time)
+
+def cell_series_milp(max_workers: int = 48, workload=None, stage_caps: Optional[Dict[str, int]] = None,
+                     time_limit: Optional[float] = None, msg: bool = False) -> Tuple[float, Dict]:
+    """
+    直线型CELL的 MILP 模型，参数同 cell_unit_milp(stage_caps 为各阶段人数上限)
+    返回与 math3_2.cell_series_optimization 相同格式的结果
+    """
+    wl = _as_workload(workload)
+    w = wl.matrix.sum(axis=0)
+    caps = _stage_caps(wl.stages, stage_caps, max_workers)
+    ub = max_workers - (len(w) - 1)
+    t_lo = w.sum() / max_workers
+    options = [_count_options(float(w[j]), 1, min(ub, caps[j]), t_lo) for j in range(len(w))]
+
+    chosen = _solve_min_makespan(options, [], max_workers, time_limit, msg)
+    if chosen is None:
+        return float('inf'), {}
+    min_time, counts = _canonical_counts(options, chosen, [], max_workers,
+                                         lambda j, limit: min(limit, caps[j]))
+    return min_time, _series_config(w, wl.stages, np.array(counts), min_time)
+
+def cell_parallel_milp(max_workers: int = 48, min_processes: int = 2, workload=None,
+                       max_processes: Optional[int] = None, max_lines: Optional[int] = None,
+                       stage_caps: Optional[Dict[str, int]] = None,
+                       time_limit: Optional[float] = None, msg: bool = False) -> Tuple[float, Dict]:
+    """
+    混联型CELL(n 条线 × s 个工序)的 MILP 模型
+    min_processes / max_processes -- 每条生产线的工序数上下限
+    max_lines -- 每个阶段的生产线数上限
+    stage_caps -- 各阶段人数上限
+    候选为每个阶段所有可拆分的人数 a(取线数最少的拆分)；受约束时部分人数无法拆分，
+    剩余工人无处安置时总人数可能少于 max_workers
+    返回与 math3_2.cell_parallel_optimization 相同格式的结果
+    """
+    wl = _as_workload(workload)
+    w = wl.matrix.sum(axis=0)
+    caps = _stage_caps(wl.stages, stage_caps, max_workers)
+    splits = _divisor_splits(max_workers, min_processes, max_processes, max_lines)
+    feasible = np.flatnonzero(splits)
+    t_lo = w.sum() / max_workers
+
+    options = []
+    for j in range(len(w)):
+        counts = feasible[feasible <= caps[j]]
+        # 只保留到第一个耗时不超过总时间下界的人数为止
+        enough = np.flatnonzero(w[j] / np.maximum(counts, 1) <= t_lo)
+        if len(enough):
+            counts = counts[:enough[0] + 1]
+        if len(counts) == 0:
+            return float('inf'), {}
+        options.append([(int(a), float(w[j]) / int(a)) for a in counts])
+
+    chosen = _solve_min_makespan(options, [], max_workers, time_limit, msg)
+    if chosen is None:
+        return float('inf'), {}
+    def largest_feasible(j, limit):
+        usable = feasible[feasible <= min(limit, caps[j])]
+        return int(usable[-1]) if len(usable) else 0
+
+    min_time, counts = _canonical_counts(options, chosen, [], max_workers, largest_feasible)
+    return min_time, _parallel_config(w, wl.stages, np.array(counts), min_time, splits)
@@ -0,0 +1,70 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import math1
+import math2
+from streaming import RunningMoments
+
+def _split(total, parts):
+    # 把 total 次仿真尽量均匀地分成 parts 份
+    base, extra = divmod(total, parts)
+    return [base + (i < extra) for i in range(parts)]
+
+def _run_tasks(func, tasks, workers):
+    if workers == 1:
+        return [func(*task) for task in tasks]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # map 按提交顺序返回，合并结果与各进程完成先后无关
+        return list(pool.map(func, *zip(*tasks)))
+
+def _production_task(N, s, low, high, total_time, num_simulations, chunk_size, seed):
+    return math1._stream_production_capacity(N, s, low, high, total_time, num_simulations,
+                                             chunk_size, np.random.default_rng(seed))
+
+def _capacity_task(N, S, T, k, total_time, simulations, chunk_size, seed):
+    return math2._stream_capacity(N, S, T, k, total_time, simulations, chunk_size,
+                                  np.random.default_rng(seed))
+
+def _prepare(num_simulations, seed, workers):
+    workers = os.cpu_count() if workers is None else max(1, int(workers))
+    workers = max(1, min(workers, num_simulations))
+    seed_seq = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+    return workers, _split(num_simulations, workers), seed_seq.spawn(workers)
+
+def parallel_production_capacity(N, s, T, k, total_time, num_simulations=10000, seed=None,
+                                 workers=None, chunk_size=2**16):
+    """
+    math1.simulate_production_capacity 的多进程版本，返回相同结构的统计结果字典
+    seed -- 随机种子(整数或 SeedSequence)，由 SeedSequence.spawn 为每个进程派生独立的 Generator
+    workers -- 进程数，默认 CPU 核数；相同 seed 与 workers 下结果逐位一致
+    chunk_size -- 每个进程内的流式批大小
+    各进程返回流式矩与分位数草图，按进程编号顺序合并
+    """
+    low, high = math1._step_time_range(s, T, k, '流式模式')
+    workers, sizes, seeds = _prepare(num_simulations, seed, workers)
+    tasks = [(N, s, low, high, total_time, n, chunk_size, child)
+             for n, child in zip(sizes, seeds)]
+
+    moments, sketch = None, None
+    for part_moments, part_sketch in _run_tasks(_production_task, tasks, workers):
+        moments = part_moments if moments is None else moments.merge(part_moments)
+        sketch = part_sketch if sketch is None else sketch.merge(part_sketch)
+
+    return math1._summarize((moments, sketch), math1._distribution_params(s, T, k))
+
+def parallel_capacity(N, S, T, k, total_time, simulations, seed=None, workers=None,
+                      chunk_size=2**16):
+    """
+    math2.simulate_capacity 的多进程版本，返回 (平均产能, 产能标准差)
+    参数含义同 parallel_production_capacity
+    """
+    workers, sizes, seeds = _prepare(simulations, seed, workers)
+    tasks = [(N, S, T, k, total_time, n, chunk_size, child)
+             for n, child in zip(sizes, seeds)]
+
+    moments = RunningMoments()
+    for part in _run_tasks(_capacity_task, tasks, workers):
+        moments.merge(part)
+    return moments.mean, moments.std
@@ -0,0 +1,109 @@
+"""
+绘图的公共工具
+    无界面模式: use_headless() 或环境变量 MPLBACKEND=Agg，finish() 只保存文件并关闭图形，不阻塞
+    大数据量: decimate() 对折线做分段最值抽稀，scatter() 点数过多时改为六边形分箱
+    批量出图: RenderPool 在后台进程池中渲染并写文件
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import matplotlib
+import numpy as np
+
+NON_INTERACTIVE_BACKENDS = {'agg', 'cairo', 'pdf', 'pgf', 'ps', 'svg', 'template'}
+
+def use_headless():
+    """
+    切换到 Agg 后端，之后的 plt.show() 不再弹出窗口
+    """
+    matplotlib.use('Agg', force=True)
+
+def is_headless():
+    return matplotlib.get_backend().lower() in NON_INTERACTIVE_BACKENDS
+
+def finish(fig, output=None, show=None):
+    """
+    收尾一张图
+    output -- 保存路径，None 不保存
+    show -- 是否调用 plt.show()；None 时仅在交互式后端下显示，无界面后端下直接关闭图形释放内存
+    """
+    import matplotlib.pyplot as plt
+
+    if output is not None:
+        directory = os.path.dirname(os.path.abspath(output))
+        os.makedirs(directory, exist_ok=True)
+        fig.savefig(output)
+    if show is None:
+        show = not is_headless()
+    if show:
+        plt.show()
+    else:
+        plt.close(fig)
+
+def decimate(y, max_points=5000):
+    """
+    折线抽稀: 点数超过 max_points 时把序列等分为 max_points/2 段，每段保留最小值与最大值所在的点，
+    保持折线的上下包络；返回保留点的下标(升序)
+    """
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if n <= max_points:
+        return np.arange(n)
+    buckets = max(1, max_points // 2)
+    size = -(-n // buckets)
+    padded = np.full(buckets * size, np.nan)
+    padded[:n] = y
+    padded = padded.reshape(buckets, size)
+    # 末段可能全为填充值，不参与
+    valid = ~np.all(np.isnan(padded), axis=1)
+    offsets = np.arange(buckets)[valid] * size
+    padded = padded[valid]
+    lo = np.nanargmin(padded, axis=1) + offsets
+    hi = np.nanargmax(padded, axis=1) + offsets
+    return np.unique(np.concatenate([lo, hi]))
+
+def scatter(ax, x, y, c=None, max_points=5000, gridsize=60, **kwargs):
+    """
+    点数不超过 max_points 时与 ax.scatter 相同；否则用 ax.hexbin 按六边形分箱，
+    颜色取箱内 c 的均值(无 c 时为点数)，绘制开销与点数无关
+    返回可用于 colorbar 的对象
+    """
+    x = np.asarray(x)
+    if len(x) <= max_points:
+        return ax.scatter(x, y, c=c, **kwargs)
+    kwargs.pop('alpha', None)
+    if c is None:
+        return ax.hexbin(x, y, gridsize=gridsize, mincnt=1, cmap=kwargs.get('cmap'))
+    return ax.hexbin(x, y, C=c, reduce_C_function=np.mean, gridsize=gridsize,
+                     cmap=kwargs.get('cmap'))
+
+def _init_worker():
+    use_headless()
+
+def _render(plot, args, kwargs, output):
+    plot(*args, output=output, show=False, **kwargs)
+    return output
+
+class RenderPool:
+    """
+    后台渲染进程池，子进程使用 Agg 后端
+    plot 须为模块级函数并接受 output、show 两个关键字参数(如 math1.plot_results)
+        with RenderPool(workers=4) as pool:
+            futures = [pool.submit(plot_results, df, output=f'report/{i}.png') for i, df in ...]
+    submit 返回 Future，其结果为输出路径；退出 with 时等待全部渲染完成
+    """
+
+    def __init__(self, workers=None):
+        self._executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker)
+
+    def submit(self, plot, *args, output, **kwargs):
+        return self._executor.submit(_render, plot, args, kwargs, output)
+
+    def close(self, wait=True):
+        self._executor.shutdown(wait=wait)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
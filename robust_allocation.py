@@ -0,0 +1,192 @@
+import math
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from instrumentation import phase, timed
+from math3_2 import _as_workload, _parallel_allocation
+
+# 随机优势比较所用的分位点(%)
+DOMINANCE_GRID = np.linspace(1, 99, 50)
+
+def _stage_samples(workload: float, n: np.ndarray, s: np.ndarray, v: np.ndarray,
+                   spread: float) -> np.ndarray:
+    """
+    一个阶段若干拆分方式(n 条线 × s 个工序)的随机耗时样本，形状 (仿真次数, 拆分数)
+    每条线 s 个工序、工序时间 U(t(1 - spread), t(1 + spread))，节拍为 t(1 + spread(2M - 1))，
+    M 为 s 个 U(0,1) 的最大值，取 M = V^(1/s)(V ~ U(0,1))；v 为该阶段各线的 V，形状 (仿真次数, 最大线数)，
+    所有拆分方式使用同一批 v(公共随机数)。阶段速率为各线 s / (1 + spread(2M - 1)) 之和(人·分钟/分钟)，
+    耗时 = 工作量 / 速率；工序数相同的拆分共用一次累加
+    """
+    samples = np.empty((len(v), len(n)))
+    for s_value in np.unique(s):
+        cols = np.flatnonzero(s == s_value)
+        n_max = int(n[cols].max())
+        rates = s_value / (1 + spread * (2 * v[:, :n_max] ** (1.0 / s_value) - 1))
+        samples[:, cols] = workload / np.cumsum(rates, axis=1)[:, n[cols] - 1]
+    return samples
+
+def _stage_options(max_workers: int, min_processes: int) -> Tuple[np.ndarray, np.ndarray]:
+    # 所有 n*s <= max_workers、s >= min_processes 的拆分方式 (线数, 工序数)
+    pairs = [(n, s) for s in range(max(min_processes, 1), max_workers + 1)
+             for n in range(1, max_workers // s + 1)]
+    n, s = np.array(pairs).T
+    return n, s
+
+def _dominated(workers: np.ndarray, grid: np.ndarray) -> np.ndarray:
+    """
+    一阶随机占优剪枝: 若另一拆分人数不多于它、各分位点耗时均不大于它(且不完全相同)，则该拆分被占优。
+    各阶段相互独立，把被占优的拆分换成占优者不会使总完成时间的分布变差
+    grid -- 各拆分在 DOMINANCE_GRID 分位点上的耗时，形状 (拆分数, 分位点数)
+    """
+    no_worse = (workers[:, None] <= workers[None, :]) & np.all(grid[:, None] <= grid[None, :], axis=2)
+    strictly = (workers[:, None] < workers[None, :]) | np.any(grid[:, None] < grid[None, :], axis=2)
+    # 完全相同的拆分只保留下标最小的一个
+    earlier = np.arange(len(workers))[:, None] < np.arange(len(workers))[None, :]
+    return np.any(no_worse & (strictly | earlier), axis=0)
+
+def _minimax_bound(options: List[Dict], max_workers: int) -> float:
+    """
+    各阶段选一个拆分、总人数不超过 max_workers 时，max_j(阶段 j 的 q' 分位数) 的最小值
+    对阈值 x，阶段 j 所需最少人数为分位数不超过 x 的拆分中的最少人数，取总人数可行的最小 x
+    """
+    thresholds = np.unique(np.concatenate([o['upper'] for o in options]))
+    needed = np.zeros(len(thresholds))
+    for o in options:
+        order = np.argsort(o['upper'], kind='stable')
+        cheapest = np.minimum.accumulate(o['workers'][order].astype(float))
+        idx = np.searchsorted(o['upper'][order], thresholds, side='right') - 1
+        needed += np.where(idx >= 0, cheapest[np.maximum(idx, 0)], np.inf)
+    feasible = np.flatnonzero(needed <= max_workers)
+    return float(thresholds[feasible[0]]) if len(feasible) else float('inf')
+
+def _combine(options: List[Dict], max_workers: int) -> np.ndarray:
+    # 各阶段存活拆分的全部组合(总人数不超过 max_workers)，返回各阶段拆分下标，形状 (候选数, 阶段数)
+    least = [int(o['workers'].min()) for o in options]
+    combos = np.zeros((1, 0), dtype=int)
+    used = np.zeros(1, dtype=int)
+    for j, o in enumerate(options):
+        rest = sum(least[j + 1:])
+        k = len(o['workers'])
+        combos = np.concatenate([np.repeat(combos, k, axis=0),
+                                 np.tile(np.arange(k), len(combos))[:, None]], axis=1)
+        used = np.repeat(used, k) + np.tile(o['workers'], len(used))
+        ok = used + rest <= max_workers
+        combos, used = combos[ok], used[ok]
+    return combos
+
+@timed('robust_allocation')
+def robust_allocation(max_workers: int = 48, k: float = 8, workload=None, min_processes: int = 2,
+                      quantile: float = 95, budget: int = 2_000_000, eta: int = 3,
+                      screen_simulations: int = 1000, min_simulations: int = 64,
+                      max_simulations: int = 20000, max_candidates: int = 100000,
+                      rng=None) -> Tuple[float, Dict]:
+    """
+    以随机产能模型为目标的混联型CELL工人分配: 最小化总完成时间(各阶段耗时最大值)的 quantile 分位数，
+    默认 95% 分位数，即 5% 分位数的产出速率最大
+    k -- 熟练程度系数，工序时间与 math1 相同为 U(t ± sqrt(3)t/k)，要求 k > sqrt(3)
+    budget -- 逐次减半阶段的仿真预算(候选数 × 仿真次数之和)，限定总计算量
+    eta -- 逐次减半的淘汰比例，每轮保留约 1/eta 的候选
+    screen_simulations -- 剪枝时估计各阶段耗时分布所用的仿真次数
+    min_simulations / max_simulations -- 逐次减半每轮每个候选的仿真次数上下限
+    max_candidates -- 剪枝后候选过多时只保留下界最小的这些
+    rng -- 随机数生成器，默认使用全局 np.random
+
+    1. 剪枝: 各阶段相互独立，总完成时间的 q 分位数不小于各阶段 q 分位数的最大值(下界)，
+       不大于各阶段 q' = 1 - (1 - q)/阶段数 分位数的最大值(上界)。对上界做最小化(与确定性模型相同的
+       二分)得到 UB，下界超过 UB 的拆分与组合都不可能最优；再去掉被更省人的拆分一阶随机占优的拆分
+    2. 逐次减半: 各轮在同一批公共随机数的前缀上评估存活候选，保留分位数最小的 1/eta，
+       仿真次数逐轮增加，候选数与每轮仿真次数均有上限，计算量有界
+    返回 (总完成时间分位数, 配置)；配置含各阶段 (线数, 工序数)、确定性耗时 times / total_time、
+    makespan_quantile / makespan_mean、deterministic(确定性最优配置在同一批样本上的结果)，
+    以及 candidates(剪枝后的候选数)、rounds、evaluations(候选数 × 仿真次数)
+    """
+    wl = _as_workload(workload)
+    rng = np.random if rng is None else rng
+    spread = np.sqrt(3) / k
+    if spread >= 1:
+        raise ValueError("要求 k > sqrt(3)，否则工序时间下限非正")
+    workloads = wl.matrix.sum(axis=0)
+    n_stages = len(workloads)
+
+    det_time, det_config = _parallel_allocation(workloads, wl.stages, max_workers, min_processes)
+    if not det_config:
+        return float('inf'), {}
+    all_n, all_s = _stage_options(max_workers, min_processes)
+    max_lines = int(all_n.max())
+    v = rng.random((screen_simulations, n_stages, max_lines))
+
+    upper_q = 100 - (100 - quantile) / n_stages
+    with phase('robust.screen', space=math.comb(max_workers, n_stages)) as probe:
+        options = []
+        for j, w in enumerate(workloads):
+            samples = _stage_samples(w, all_n, all_s, v[:, j], spread)
+            lower, upper = np.percentile(samples, [quantile, upper_q], axis=0)
+            options.append({'n': all_n, 's': all_s, 'workers': all_n * all_s, 'lower': lower,
+                            'upper': upper, 'samples': samples})
+        bound = _minimax_bound(options, max_workers)
+        for j, o in enumerate(options):
+            keep = o['lower'] <= bound
+            o = {key: value[keep] if key != 'samples' else value[:, keep] for key, value in o.items()}
+            grid = np.percentile(o['samples'], DOMINANCE_GRID, axis=0).T
+            keep = ~_dominated(o['workers'], grid)
+            options[j] = {key: value[keep] for key, value in o.items() if key != 'samples'}
+        combos = _combine(options, max_workers)
+        lower = np.max([options[j]['lower'][combos[:, j]] for j in range(n_stages)], axis=0)
+        combos = combos[lower <= bound]
+        if len(combos) > max_candidates:
+            combos = combos[np.argsort(lower[lower <= bound], kind='stable')[:max_candidates]]
+        probe['candidates'] = len(combos)
+    lines = np.stack([options[j]['n'][combos[:, j]] for j in range(n_stages)], axis=1)
+    procs = np.stack([options[j]['s'][combos[:, j]] for j in range(n_stages)], axis=1)
+    det = np.max(workloads / (lines * procs), axis=1)
+
+    # 各轮保留数与仿真次数，预算在各轮间平均分配，仿真次数逐轮不减
+    rounds = max(1, int(np.ceil(np.log(len(lines)) / np.log(eta)))) if len(lines) > 1 else 1
+    sizes = [max(1, int(np.ceil(len(lines) / eta ** r))) for r in range(rounds)] + [1]
+    sims = [int(np.clip(budget / (rounds * sizes[r]), min_simulations, max_simulations))
+            for r in range(rounds)]
+    sims = [int(x) for x in np.maximum.accumulate(sims)]
+    if sims[-1] > len(v):
+        # 追加样本，前缀保持不变
+        v = np.concatenate([v, rng.random((sims[-1] - len(v), n_stages, max_lines))])
+
+    def makespans(cand_lines, cand_procs, n_sims):
+        result = np.full((n_sims, len(cand_lines)), -np.inf)
+        for j, w in enumerate(workloads):
+            pairs, inverse = np.unique(np.stack([cand_lines[:, j], cand_procs[:, j]], axis=1),
+                                       axis=0, return_inverse=True)
+            samples = _stage_samples(w, pairs[:, 0], pairs[:, 1], v[:n_sims, j], spread)
+            np.maximum(result, samples[:, inverse.ravel()], out=result)
+        return result
+
+    alive = np.arange(len(lines))
+    evaluations = 0
+    for r in range(rounds):
+        with phase('robust.halving', candidates=len(alive)):
+            scores = np.percentile(makespans(lines[alive], procs[alive], sims[r]), quantile, axis=0)
+            evaluations += sims[r] * len(alive)
+            order = np.lexsort((det[alive], scores))
+            alive = alive[order[:sizes[r + 1]]]
+
+    best = alive[0]
+    det_lines = np.array([[det_config[stage][0] for stage in wl.stages]])
+    det_procs = np.array([[det_config[stage][1] for stage in wl.stages]])
+    final = makespans(np.concatenate([lines[[best]], det_lines]),
+                      np.concatenate([procs[[best]], det_procs]), len(v))
+    q_best, q_det = np.percentile(final, quantile, axis=0)
+
+    config = {stage: (int(lines[best, j]), int(procs[best, j])) for j, stage in enumerate(wl.stages)}
+    config['times'] = tuple(float(w) / int(lines[best, j] * procs[best, j])
+                            for j, w in enumerate(workloads))
+    config['total_time'] = float(det[best])
+    config.update({
+        'makespan_quantile': float(q_best),
+        'makespan_mean': float(final[:, 0].mean()),
+        'deterministic': {'config': det_config, 'makespan_quantile': float(q_det),
+                          'makespan_mean': float(final[:, 1].mean())},
+        'candidates': len(lines),
+        'rounds': rounds,
+        'evaluations': evaluations,
+    })
+    return float(q_best), config
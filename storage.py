@@ -0,0 +1,84 @@
+"""
+原始仿真样本的内存映射存储
+目录结构:
+    total_capacities.npy -- 每次仿真的总产能，形状 (仿真次数,)
+    cycle_times.npy      -- 每次仿真每条生产线的节拍，形状 (仿真次数, 生产线数)
+    params.json          -- 仿真参数与数据类型
+.npy 文件由 np.lib.format.open_memmap 创建，仿真时分批直接写入；读取时 np.load(mmap_mode='r')
+按需分页映射，不复制到内存
+"""
+import json
+import os
+
+import numpy as np
+
+SAMPLE_DTYPE = np.float32
+FILES = {'total_capacities': 'total_capacities.npy', 'cycle_times': 'cycle_times.npy'}
+
+class SampleWriter:
+    """
+    按批写入原始样本
+    directory -- 输出目录，不存在时创建；已有的样本文件会被覆盖
+    num_simulations, N -- 仿真次数与生产线数，决定文件形状
+    params -- 写入 params.json 的仿真参数
+    dtype -- 存储的数据类型，默认 float32
+    """
+
+    def __init__(self, directory, num_simulations, N, params=None, dtype=SAMPLE_DTYPE):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.total_capacities = np.lib.format.open_memmap(
+            os.path.join(directory, FILES['total_capacities']), mode='w+', dtype=dtype,
+            shape=(num_simulations,))
+        self.cycle_times = np.lib.format.open_memmap(
+            os.path.join(directory, FILES['cycle_times']), mode='w+', dtype=dtype,
+            shape=(num_simulations, N))
+        meta = {'num_simulations': num_simulations, 'N': N, 'dtype': np.dtype(dtype).name,
+                'params': params or {}}
+        with open(os.path.join(directory, 'params.json'), 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False, indent=2, default=float)
+
+    def write(self, start, cycle_times, total_capacities):
+        stop = start + len(total_capacities)
+        self.cycle_times[start:stop] = cycle_times
+        self.total_capacities[start:stop] = total_capacities
+
+    def close(self):
+        self.total_capacities.flush()
+        self.cycle_times.flush()
+        del self.total_capacities, self.cycle_times
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def load_samples(directory, mmap_mode='r'):
+    """
+    读取 SampleWriter 写入的样本，返回字典: total_capacities、cycle_times(内存映射数组)和 params
+    mmap_mode -- 传给 np.load，默认只读映射；None 时整体读入内存
+    """
+    with open(os.path.join(directory, 'params.json'), encoding='utf-8') as f:
+        meta = json.load(f)
+    result = {name: np.load(os.path.join(directory, file), mmap_mode=mmap_mode)
+              for name, file in FILES.items()}
+    result['params'] = meta
+    return result
+
+def describe(directory, percentiles=(5, 50, 95), chunk_size=2**20):
+    """
+    由已保存的总产能重新计算统计量，无需重新仿真
+    均值与标准差按块以 float64 累计；分位数需要整体排序，在内存映射数组上直接计算
+    返回字典: mean、std、min、max 以及 p<q>(如 p5、p50、p95)
+    """
+    from streaming import RunningMoments
+
+    values = load_samples(directory)['total_capacities']
+    moments = RunningMoments()
+    for start in range(0, len(values), chunk_size):
+        moments.update(values[start:start + chunk_size])
+    result = {name: float(getattr(moments, name)) for name in ('mean', 'std', 'min', 'max')}
+    for q, value in zip(percentiles, np.percentile(values, percentiles)):
+        result[f'p{q:g}'] = float(value)
+    return result
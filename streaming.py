@@ -0,0 +1,95 @@
+import numpy as np
+
+class RunningMoments:
+    """
+    流式统计量: 样本数、均值、离差平方和、最小值、最大值
+    每批数据先求批内均值与离差平方和，再按 Welford 方法的批量形式(Chan 等人的并行公式)合并，
+    内存占用与已处理样本数无关，且两个累加器可以直接合并
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float).ravel()
+        if values.size == 0:
+            return self
+        batch = RunningMoments()
+        batch.count = values.size
+        batch.mean = float(np.mean(values))
+        batch.m2 = float(np.sum((values - batch.mean) ** 2))
+        batch.min = float(np.min(values))
+        batch.max = float(np.max(values))
+        return self.merge(batch)
+
+    def merge(self, other: 'RunningMoments'):
+        if other.count == 0:
+            return self
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / total
+        self.m2 += other.m2 + delta ** 2 * self.count * other.count / total
+        self.count = total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    @property
+    def var(self):
+        # 与 np.var 一致的总体方差
+        return self.m2 / self.count if self.count else np.nan
+
+    @property
+    def std(self):
+        return np.sqrt(self.var)
+
+class QuantileSketch:
+    """
+    固定区间的直方图分位数草图
+    产能的取值范围可由工序时间的上下限解析得到，因此可预先固定分箱边界:
+    更新只需累加计数，两个草图按箱相加即可合并，结果与合并顺序无关；
+    分位数误差不超过一个箱宽 (high - low) / bins
+    """
+
+    def __init__(self, low, high, bins=2**16):
+        if not high > low:
+            high = low + max(abs(low), 1.0) * 1e-12
+        self.low = float(low)
+        self.high = float(high)
+        self.counts = np.zeros(int(bins), dtype=np.int64)
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float).ravel()
+        bins = len(self.counts)
+        idx = np.floor((values - self.low) / (self.high - self.low) * bins).astype(np.int64)
+        self.counts += np.bincount(np.clip(idx, 0, bins - 1), minlength=bins)
+        return self
+
+    def merge(self, other: 'QuantileSketch'):
+        if (other.low, other.high, len(other.counts)) != (self.low, self.high, len(self.counts)):
+            raise ValueError("只能合并分箱边界相同的草图")
+        self.counts += other.counts
+        return self
+
+    @property
+    def count(self):
+        return int(self.counts.sum())
+
+    def percentile(self, q):
+        """
+        q -- 百分位数(0~100)，可为标量或数组
+        箱内按线性插值
+        """
+        q = np.asarray(q, dtype=float)
+        cum = np.cumsum(self.counts)
+        target = q / 100 * cum[-1]
+        idx = np.clip(np.searchsorted(cum, target, side='left'), 0, len(cum) - 1)
+        before = np.where(idx > 0, cum[np.maximum(idx - 1, 0)], 0)
+        inside = self.counts[idx]
+        frac = np.where(inside > 0, (target - before) / np.maximum(inside, 1), 0.0)
+        width = (self.high - self.low) / len(self.counts)
+        return self.low + (idx + np.clip(frac, 0, 1)) * width
@@ -0,0 +1,155 @@
+"""
+math3_2 分配算法与逐一枚举(原始参考实现)的一致性检查
+    python -m pytest -q test_allocation.py
+"""
+import itertools
+
+import numpy as np
+import pytest
+
+from instrumentation import record
+from math3_2 import (_divisor_splits, _minimax_allocation, _repair_allocation,
+                     cell_parallel_optimization, cell_series_optimization, cell_unit_optimization,
+                     load_workload, reoptimize)
+
+def brute_force_allocation(workloads, max_workers, min_workers=1):
+    """
+    逐一枚举所有 sum(x) = max_workers、x_i >= min_workers 的分配，
+    返回 (最短总时间, 各单元人数)；按字典序遍历、严格更优才替换，多个最优解时取字典序最小者
+    """
+    w = [float(v) for v in workloads]
+    best_time, best = float('inf'), None
+    for head in itertools.product(range(min_workers, max_workers + 1), repeat=len(w) - 1):
+        x = head + (max_workers - sum(head),)
+        if x[-1] < min_workers:
+            continue
+        t = max(wi / xi for wi, xi in zip(w, x))
+        if t < best_time:
+            best_time, best = t, x
+    return best_time, best
+
+def random_cases(seed, count, max_units=4, max_total=14):
+    # 随机工作量(含整数、小数与零工作量)、单元数与总人数
+    rng = np.random.default_rng(seed)
+    for _ in range(count):
+        n = int(rng.integers(1, max_units + 1))
+        kind = rng.integers(3)
+        if kind == 0:
+            w = rng.integers(1, 60, size=n).astype(float)
+        elif kind == 1:
+            w = rng.uniform(0.1, 100, size=n)
+        else:
+            w = rng.integers(0, 5, size=n).astype(float)
+        yield w, int(rng.integers(n, max_total + 1))
+
+@pytest.mark.parametrize('min_workers', [1, 2])
+def test_minimax_matches_enumeration(min_workers):
+    for w, max_workers in random_cases(min_workers, 400):
+        expected_time, expected = brute_force_allocation(w, max_workers, min_workers)
+        min_time, workers = _minimax_allocation(w, max_workers, min_workers)
+        if expected is None:
+            assert workers is None and min_time == float('inf')
+            continue
+        assert min_time == expected_time
+        assert tuple(int(v) for v in workers) == expected
+
+def test_minimax_zero_workloads():
+    min_time, workers = _minimax_allocation([0.0, 0.0, 0.0], 7)
+    assert min_time == 0.0
+    assert workers.tolist() == [1, 1, 5]
+    min_time, workers = _minimax_allocation([0.0, 5.0, 0.0], 7, 2)
+    assert (min_time, tuple(workers.tolist())) == brute_force_allocation([0.0, 5.0, 0.0], 7, 2)
+
+def test_minimax_infeasible():
+    assert _minimax_allocation([1.0, 2.0, 3.0], 5, 2) == (float('inf'), None)
+
+def test_load_workload_counts():
+    # 只给产量时沿用题目的节拍时间
+    default = load_workload()
+    changed = load_workload(counts=[120, 500])
+    assert changed.matrix[0].tolist() == [120 * 96, 120 * 64, 120 * 64]
+    assert np.array_equal(changed.matrix[1], default.matrix[1])
+    assert (changed.products, changed.stages) == (default.products, default.stages)
+
+@pytest.mark.parametrize('max_workers', list(range(6, 40)) + [48])
+def test_series_problem_matches_enumeration(max_workers):
+    # 题目数据的直线型CELL(3 个阶段)，与原始逐层枚举的人数范围一致
+    w = load_workload().matrix.sum(axis=0)
+    expected_time, expected = brute_force_allocation(w, max_workers)
+    min_time, workers = _minimax_allocation(w, max_workers)
+    assert min_time == expected_time
+    assert tuple(workers.tolist()) == expected
+
+def test_series_milp_matches_enumeration():
+    pytest.importorskip('pulp')
+    from milp import cell_series_milp
+
+    for w, max_workers in random_cases(7, 15, max_units=3):
+        if not np.any(w > 0):
+            continue
+        expected_time, expected = brute_force_allocation(w, max_workers)
+        min_time, config = cell_series_milp(max_workers, workload=w[None, :])
+        assert min_time == pytest.approx(expected_time)
+        assert tuple(config[stage] for stage in config if stage.startswith('stage')) == expected
+
+@pytest.mark.parametrize('max_workers', list(range(6, 40)) + [48])
+def test_parallel_problem_matches_enumeration(max_workers):
+    # 每个阶段 n 条线 × s 个工序(s >= 2)，枚举阶段人数，线数取最少
+    w = load_workload().matrix.sum(axis=0)
+    expected_time, expected = brute_force_allocation(w, max_workers, 2)
+    min_time, config = cell_parallel_optimization(max_workers)
+    assert min_time == expected_time
+    assert tuple(n * s for n, s in (config[stage] for stage in load_workload().stages)) == expected
+    assert all(config[stage][0] == 1 for stage in load_workload().stages)
+
+@pytest.mark.parametrize('min_processes, max_processes, max_lines',
+                         [(1, None, None), (2, None, None), (3, 5, None), (2, None, 4), (4, 6, 3)])
+def test_divisor_splits_matches_definition(min_processes, max_processes, max_lines):
+    max_workers = 120
+    splits = _divisor_splits(max_workers, min_processes, max_processes, max_lines)
+    for a in range(max_workers + 1):
+        lines = [n for n in range(1, a + 1) if a % n == 0 and a // n >= min_processes
+                 and (max_processes is None or a // n <= max_processes)
+                 and (max_lines is None or n <= max_lines)]
+        assert splits[a] == (lines[0] if lines else 0)
+
+@pytest.mark.parametrize('min_workers', [1, 2])
+def test_repair_matches_enumeration(min_workers):
+    # 从任意起点修复后总时间与枚举最优一致(多个最优解时分配可以不同)
+    rng = np.random.default_rng(10 + min_workers)
+    for w, max_workers in random_cases(20 + min_workers, 300):
+        expected_time, expected = brute_force_allocation(w, max_workers, min_workers)
+        start = rng.integers(1, max_workers + 1, size=len(w))
+        min_time, workers = _repair_allocation(w, max_workers, start, min_workers)
+        if expected is None:
+            assert workers is None
+            continue
+        assert min_time == expected_time
+        assert workers.sum() == max_workers and workers.min() >= min_workers
+        assert np.max(w / workers) == expected_time
+
+@pytest.mark.parametrize('max_workers', [3000, 300000])
+def test_reoptimize_parallel_is_incremental(max_workers):
+    # 20 个产品 × 8 个阶段增加 5 人: 总时间与重新求解一致，调动次数只与变化量有关、与总人数无关
+    w = np.random.default_rng(0).integers(1, 100, size=(20, 8)).astype(float)
+    _, previous = cell_parallel_optimization(max_workers, workload=w)
+    with record() as rec:
+        min_time, config = reoptimize(previous, max_workers + 5, workload=w)
+    assert min_time == cell_parallel_optimization(max_workers + 5, workload=w)[0]
+    splits = [config[stage] for stage in load_workload(w).stages]
+    assert sum(n * s for n, s in splits) == max_workers + 5
+    assert all(s >= 2 for _, s in splits)
+    assert rec.phases['repair.resize']['candidates'] == 5
+    assert rec.phases['repair.exchange']['candidates'] <= 3
+
+def test_reoptimize_unnamed_workload():
+    # 不带名称的工作量矩阵沿用原配置的阶段与产品名称
+    _, series = cell_series_optimization(48)
+    matrix = np.array([[9600, 6400, 6400], [16000, 10500, 12000]])
+    assert reoptimize(series, 46, workload=matrix)[0] == cell_series_optimization(46)[0]
+    _, unit = cell_unit_optimization(48)
+    changed = load_workload(counts=[120, 500])
+    assert reoptimize(unit, 48, workload=changed.matrix)[0] == \
+        cell_unit_optimization(48, workload=changed)[0]
+    with pytest.raises(ValueError):
+        reoptimize(unit, 48, workload=matrix[:, :2])
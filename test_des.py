@@ -0,0 +1,39 @@
+"""
+逐件仿真递推与逐件逐工位的标量参考实现对照
+    python -m pytest -q test_des.py
+"""
+import numpy as np
+import pytest
+
+from des import departure_times
+
+def reference_departures(service, buffers=None):
+    """
+    加工后阻塞(BAS)的标量递推: 产品 i 在工位 j 开工须等上一产品离开 j、本产品离开 j-1，
+    加工完成后须等产品 i-b-1 离开工位 j+1 才能离开(b 为 j 与 j+1 之间的缓冲容量)
+    """
+    n_items, n_stations = service.shape
+    D = np.zeros((n_items, n_stations))
+    for i in range(n_items):
+        for j in range(n_stations):
+            start = max(D[i - 1, j] if i > 0 else 0.0, D[i, j - 1] if j > 0 else 0.0)
+            finish = start + service[i, j]
+            if buffers is not None and j < n_stations - 1:
+                lag = i - buffers[j] - 1
+                if lag >= 0:
+                    finish = max(finish, D[lag, j + 1])
+            D[i, j] = finish
+    return D
+
+@pytest.mark.parametrize('buffers', [None, [0, 0, 0], [2, 0, 1], [5, 5, 5]])
+def test_departures_match_reference(buffers):
+    rng = np.random.default_rng(0)
+    service = rng.uniform(0.5, 1.5, size=(6, 40, 4))
+    D = departure_times(service, buffers)
+    for line in range(len(service)):
+        expected = reference_departures(service[line], buffers)
+        np.testing.assert_allclose(D[line], expected, rtol=0, atol=1e-12)
+
+def test_scalar_buffer_matches_list():
+    service = np.random.default_rng(1).uniform(1, 3, size=(30, 3))
+    np.testing.assert_array_equal(departure_times(service, 1), departure_times(service, [1, 1]))
@@ -0,0 +1,37 @@
+"""
+Pareto 前沿与逐一枚举全部分配的对照
+    python -m pytest -q test_math3_1.py
+"""
+import numpy as np
+import pytest
+
+from math3_1 import evaluate_allocations, pareto_allocations
+
+def brute_force_front(max_workers, beats, total_time):
+    # 枚举总人数 3..max_workers 的全部分配，保留产能严格高于所有更少人数分配的 (人数, 产能)
+    front, best = [], -np.inf
+    for total in range(3, max_workers + 1):
+        capacity = evaluate_allocations(total, beats, total_time)['capacity'].max()
+        if capacity > best * (1 + 1e-12):
+            front.append((total, capacity))
+            best = capacity
+    return front
+
+@pytest.mark.parametrize('beats, total_time', [
+    ([96, 64, 64], 24 * 60),
+    ([32, 21, 24], 24 * 60),
+    ([7, 7, 7], 100),
+    ([10, 3.3, 6.1], 480),
+    ([1, 50, 2], 60),
+])
+def test_pareto_matches_enumeration(beats, total_time):
+    for max_workers in range(3, 31):
+        front = pareto_allocations(max_workers, beats, total_time)
+        headcount = front['n1'] + front['n2'] + front['n3']
+        expected = brute_force_front(max_workers, beats, total_time)
+        assert headcount.tolist() == [h for h, _ in expected]
+        np.testing.assert_allclose(front['capacity'], [c for _, c in expected], rtol=1e-12)
+        # 各行的分配确实达到所报告的产能
+        stage = np.column_stack([front['n1'], front['n2'], front['n3']]) * total_time / np.asarray(beats)
+        np.testing.assert_allclose(stage.min(axis=1), front['capacity'], rtol=1e-12)
+        assert np.all(np.diff(front['capacity']) > 0)
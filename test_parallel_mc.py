@@ -0,0 +1,29 @@
+"""
+多进程蒙特卡洛的可复现性: 相同 seed 与进程数下结果逐位一致
+    python -m pytest -q test_parallel_mc.py
+"""
+import parallel_mc
+from parallel_mc import parallel_capacity, parallel_production_capacity
+
+def test_production_capacity_is_reproducible():
+    first = parallel_production_capacity(2, 3, 10, 8, 1440, 20000, seed=7, workers=2, chunk_size=3000)
+    second = parallel_production_capacity(2, 3, 10, 8, 1440, 20000, seed=7, workers=2, chunk_size=3000)
+    assert first == second
+    other = parallel_production_capacity(2, 3, 10, 8, 1440, 20000, seed=8, workers=2, chunk_size=3000)
+    assert other['mean'] != first['mean']
+
+def test_capacity_is_reproducible():
+    first = parallel_capacity(4, 4, 10, 8, 1440, 5000, seed=7, workers=2, chunk_size=700)
+    second = parallel_capacity(4, 4, 10, 8, 1440, 5000, seed=7, workers=2, chunk_size=700)
+    assert first == second
+
+def test_single_worker_runs_in_process(monkeypatch):
+    # workers=1 不创建进程池
+    def no_pool(*args, **kwargs):
+        raise AssertionError("workers=1 不应创建进程池")
+
+    monkeypatch.setattr(parallel_mc, 'ProcessPoolExecutor', no_pool)
+    first = parallel_production_capacity(2, 3, 10, 8, 1440, 5000, seed=7, workers=1)
+    assert first == parallel_production_capacity(2, 3, 10, 8, 1440, 5000, seed=7, workers=1)
+    assert parallel_capacity(2, 3, 10, 8, 1440, 5000, seed=7, workers=1) == \
+        parallel_capacity(2, 3, 10, 8, 1440, 5000, seed=7, workers=1)
@@ -0,0 +1,123 @@
+import warnings
+
+import numpy as np
+
+import math1
+import math2
+
+METHODS = ('plain', 'antithetic', 'control', 'lhs', 'sobol')
+
+def _default_rng(rng):
+    # 未指定时从全局 np.random 派生，np.random.seed 仍可复现结果
+    return np.random.default_rng(np.random.randint(2**31)) if rng is None else rng
+
+def standard_uniforms(method, n, dim, rng):
+    """
+    生成 n 个 dim 维 U(0,1) 样本，形状 (n, dim)
+    plain / control -- 独立随机数
+    antithetic -- 成对的 u 与 1-u
+    lhs -- 拉丁超立方抽样
+    sobol -- 随机扰动(scrambled)的 Sobol 序列
+    """
+    if method in ('plain', 'control'):
+        return rng.random((n, dim))
+    if method == 'antithetic':
+        u = rng.random(((n + 1) // 2, dim))
+        return np.concatenate([u, 1 - u])[:n]
+    if method in ('lhs', 'sobol'):
+        from scipy.stats import qmc
+    if method == 'lhs':
+        return qmc.LatinHypercube(d=dim, rng=rng).random(n)
+    if method == 'sobol':
+        with warnings.catch_warnings():
+            # 样本数不是 2 的幂时 scipy 会提示均衡性下降，这里不影响估计的无偏性
+            warnings.simplefilter('ignore', UserWarning)
+            return qmc.Sobol(d=dim, scramble=True, rng=rng).random(n)
+    raise ValueError(f"未知的方差缩减方法: {method}，可选 {METHODS}")
+
+def _estimate(capacity_fn, control_mean, N, s, num_simulations, method, replicates, rng, q=5):
+    """
+    把 num_simulations 次仿真分成 replicates 个独立重复，每个重复按 method 抽样，
+    由重复间的离散程度给出均值与 q 分位数的标准误
+    capacity_fn(u) -- 由 (n, N, s) 的标准均匀数返回 (总产能, 控制变量)
+    有效样本数 = 同等精度下普通蒙特卡洛所需的独立样本数
+    """
+    rng = _default_rng(rng)
+    replicates = max(2, min(int(replicates), num_simulations // 2))
+    sizes = [num_simulations // replicates + (i < num_simulations % replicates)
+             for i in range(replicates)]
+
+    means, quantiles, samples = [], [], []
+    for n in sizes:
+        u = standard_uniforms(method, n, N * s, rng).reshape(n, N, s)
+        y, x = capacity_fn(u)
+        if method == 'control':
+            # 控制变量 x 的期望已知，beta 取重复内的最小方差系数
+            x_c = x - control_mean
+            beta = np.dot(y - y.mean(), x_c) / max(np.dot(x_c - x_c.mean(), x_c - x_c.mean()), 1e-300)
+            means.append(np.mean(y - beta * x_c))
+        else:
+            means.append(np.mean(y))
+        quantiles.append(np.percentile(y, q))
+        samples.append(y)
+
+    y = np.concatenate(samples)
+    means, quantiles = np.array(means), np.array(quantiles)
+    stderr = np.std(means, ddof=1) / np.sqrt(replicates)
+    stderr_q = np.std(quantiles, ddof=1) / np.sqrt(replicates)
+
+    # 普通蒙特卡洛下分位数估计的方差 p(1-p) / (n f^2)，密度 f 用样本分位数差分估计
+    p, dp = q / 100, 0.01
+    lo, hi = np.percentile(y, [max(q - 100 * dp, 0), min(q + 100 * dp, 100)])
+    density = (min(p + dp, 1) - max(p - dp, 0)) / (hi - lo) if hi > lo else np.inf
+    var_q = p * (1 - p) / density ** 2
+    return {
+        'mean': np.mean(means),
+        'std': np.std(y),
+        'min': np.min(y),
+        'max': np.max(y),
+        'median': np.median(y),
+        f'{q}th_percentile': np.mean(quantiles),
+        '95th_percentile': np.percentile(y, 95),
+        'method': method,
+        'num_simulations': len(y),
+        'stderr': stderr,
+        'ess': np.var(y) / stderr ** 2 if stderr > 0 else np.inf,
+        f'stderr_{q}th': stderr_q,
+        f'ess_{q}th': var_q / stderr_q ** 2 if stderr_q > 0 else np.inf,
+    }
+
+def production_capacity_vr(N, s, T, k, total_time, num_simulations=10000, method='antithetic',
+                           replicates=16, rng=None):
+    """
+    带方差缩减的 math1.simulate_production_capacity，返回的字典在原有统计量之外增加
+    method、stderr / ess(均值的标准误与有效样本数)、stderr_5th / ess_5th(5% 分位数)
+    method -- 'plain'、'antithetic'、'control'、'lhs' 或 'sobol'
+    replicates -- 独立重复数，用于估计标准误
+    rng -- np.random.Generator，默认由全局 np.random 派生
+    控制变量为各生产线 s 个均匀数最大值之和，其期望 N*s/(s+1) 已知
+    """
+    low, high = math1._step_time_range(s, T, k)
+
+    def capacity_fn(u):
+        u_max = np.max(u, axis=2)
+        return np.sum(total_time / (low + (high - low) * u_max), axis=1), np.sum(u_max, axis=1)
+
+    result = _estimate(capacity_fn, N * s / (s + 1), N, s, num_simulations, method,
+                       replicates, rng)
+    result['distribution_params'] = math1._distribution_params(s, T, k)
+    return result
+
+def capacity_vr(N, S, T, k, total_time, simulations, method='antithetic', replicates=16, rng=None):
+    """
+    带方差缩减的 math2.simulate_capacity，返回统计量字典
+    (mean、std、5th_percentile 及对应的 stderr / ess)，参数含义同 production_capacity_vr
+    """
+    low, high = math2._step_time_range(S, T, k)
+
+    def capacity_fn(u):
+        u_max = np.max(u, axis=2)
+        line_capacities = np.floor(total_time / (low + (high - low) * u_max))
+        return np.sum(line_capacities, axis=1), np.sum(u_max, axis=1)
+
+    return _estimate(capacity_fn, N * S / (S + 1), N, S, simulations, method, replicates, rng)